@@ -1,108 +1,291 @@
-import random
 import time
 
+import numpy as np
+
+from algoritmos.busca_local import BuscaLocal
+from utils.matriz_distancias import MatrizDistancias
+from utils.perfil import fase
+from utils.convergencia import TracoConvergencia, notificar
+from utils.criterio_parada import CriterioParada
+from utils.top_rotas import TopRotas
+
+
 class ACO:
-    def __init__(self, grafo, num_formigas=50, num_iteracoes=100, alfa=1.0, beta=5.0, rho=0.5, q=100):
-        self.grafo = grafo
+    def __init__(self, grafo, num_formigas=50, num_iteracoes=100, alfa=1.0, beta=5.0, rho=0.5, q=100,
+                 vetorizado=True, num_candidatos=None, variante="AS", q0=0.9, xi=0.1,
+                 intervalo_melhor_global=10, num_top_rotas=3, busca_local=False,
+                 limite_inferior=None, max_estagnacao=None, custo_alvo=None, tempo_limite=None,
+                 observadores=None, semente=None, cancelamento=None):
+        if variante not in ("AS", "MMAS", "ACS"):
+            raise ValueError(f"Variante de ACO desconhecida: {variante}")
+
+        self.matriz = MatrizDistancias.de_grafo(grafo)
         self.num_formigas = num_formigas
         self.num_iteracoes = num_iteracoes
-        self.alfa = alfa  
-        self.beta = beta  
-        self.rho = rho    
-        self.q = q        
-
-        self.feromonio = {
-            cidade: {vizinho: 1.0 for vizinho in grafo[cidade]}
-            for cidade in grafo
-        }
+        self.alfa = alfa
+        self.beta = beta
+        self.rho = rho
+        self.q = q
+        self.vetorizado = vetorizado
+        self.variante = variante
+        self.q0 = q0
+        self.xi = xi
+        self.intervalo_melhor_global = intervalo_melhor_global
+        self.num_top_rotas = num_top_rotas
+        self.busca_local = BuscaLocal(self.matriz) if busca_local else None
+        self.limite_inferior = limite_inferior
+        self.observadores = list(observadores or [])
+        # Gerador próprio: a semente (inteiro ou SeedSequence) reproduz a execução
+        self.semente = np.random.SeedSequence().entropy if semente is None else semente
+        self.rng = np.random.default_rng(self.semente)
+        self.criterio_parada = CriterioParada(num_iteracoes, max_estagnacao, custo_alvo, tempo_limite,
+                                              limite_inferior, cancelamento)
+
+        n = len(self.matriz)
+        custo_guloso = self.matriz.custo_rota(self.matriz.rota_gulosa())
+        if variante == "MMAS":
+            self.tau_max = self.q / (self.rho * custo_guloso)
+            self.tau_min = self.tau_max / (2 * n)
+            tau_inicial = self.tau_max
+        elif variante == "ACS":
+            self.tau0 = self.q / (n * custo_guloso)
+            tau_inicial = self.tau0
+        else:
+            tau_inicial = 1.0
+        self.feromonio = np.full((n, n), tau_inicial)
+        np.fill_diagonal(self.feromonio, 0.0)
+        self.melhor_rota = None
+        self.melhor_distancia = float('inf')
+        self.heuristica = self.matriz.heuristica(self.beta)
+        self.candidatos = None
+        if num_candidatos:
+            self.candidatos = self.matriz.vizinhos_proximos(num_candidatos)
 
     def escolher_proxima(self, atual, visitados):
-        vizinhos = self.grafo[atual]
-        probabilidades = []
-        soma = 0
-
-        for vizinho in vizinhos:
-            if vizinho not in visitados:
-                tau = self.feromonio[atual][vizinho] ** self.alfa
-                eta = (1 / self.grafo[atual][vizinho]) ** self.beta
-                prob = tau * eta
-                probabilidades.append((vizinho, prob))
-                soma += prob
-
-        if soma == 0:
+        if self.candidatos is not None:
+            candidatos = self.candidatos[atual]
+            candidatos = candidatos[~visitados[candidatos]]
+            if len(candidatos):
+                probabilidades = self.feromonio[atual, candidatos] ** self.alfa * self.heuristica[atual, candidatos]
+                escolha = self.sortear(probabilidades)
+                if escolha is not None:
+                    return int(candidatos[escolha])
+
+        probabilidades = self.feromonio[atual] ** self.alfa * self.heuristica[atual]
+        probabilidades[visitados] = 0.0
+        return self.sortear(probabilidades)
+
+    def sortear(self, probabilidades):
+        acumulado = np.cumsum(probabilidades)
+        soma = acumulado[-1]
+        if soma <= 0:
             return None
 
-        r = random.uniform(0, soma)
-        acumulado = 0
-        for vizinho, prob in probabilidades:
-            acumulado += prob
-            if acumulado >= r:
-                return vizinho
+        if self.variante == "ACS" and self.rng.random() < self.q0:
+            return int(np.argmax(probabilidades))
+
+        r = self.rng.random() * soma
+        return int(np.searchsorted(acumulado, r, side='right'))
+
+    def construir_rota(self, origem):
+        n = len(self.matriz)
+        visitados = np.zeros(n, dtype=bool)
+        rota = np.empty(n + 1, dtype=np.intp)
+        rota[0] = origem
+        visitados[origem] = True
+
+        tamanho = 1
+        while tamanho < n:
+            proxima = self.escolher_proxima(rota[tamanho - 1], visitados)
+            if proxima is None:
+                break
+            if self.variante == "ACS":
+                self.atualizar_feromonio_local(rota[tamanho - 1], proxima)
+            rota[tamanho] = proxima
+            visitados[proxima] = True
+            tamanho += 1
+        rota[tamanho] = origem
+        return rota[:tamanho + 1]
+
+    def roleta(self, pesos):
+        acumulado = np.cumsum(pesos, axis=1)
+        soma = acumulado[:, -1]
+
+        r = self.rng.random(len(pesos)) * soma
+        escolha = (acumulado <= r[:, None]).sum(axis=1)
+
+        # Arredondamento no fim da roleta cai no último peso positivo
+        estouro = escolha >= pesos.shape[1]
+        if estouro.any():
+            escolha[estouro] = pesos.shape[1] - 1 - np.argmax(pesos[estouro, ::-1] > 0, axis=1)
+        escolha[soma <= 0] = -1
+
+        if self.variante == "ACS":
+            gananciosas = (self.rng.random(len(pesos)) < self.q0) & (soma > 0)
+            escolha[gananciosas] = np.argmax(pesos[gananciosas], axis=1)
+        return escolha
+
+    def escolher_proximas(self, atratividade, atual, visitados):
+        formigas = np.arange(len(atual))
+        proxima = np.empty(len(atual), dtype=np.intp)
+        pendentes = formigas
+
+        if self.candidatos is not None:
+            candidatos = self.candidatos[atual]
+            pesos = atratividade[atual[:, None], candidatos]
+            pesos[visitados[formigas[:, None], candidatos]] = 0.0
+            escolha = self.roleta(pesos)
+            encontrou = escolha >= 0
+            proxima[encontrou] = candidatos[encontrou, escolha[encontrou]]
+            pendentes = formigas[~encontrou]
+
+        if len(pendentes):
+            pesos = atratividade[atual[pendentes]]
+            pesos[visitados[pendentes]] = 0.0
+            escolha = self.roleta(pesos)
+            sem_peso = escolha < 0
+            if sem_peso.any():
+                escolha[sem_peso] = np.argmax(~visitados[pendentes[sem_peso]], axis=1)
+            proxima[pendentes] = escolha
+
+        return proxima
 
-        return probabilidades[-1][0]
+    def construir_rotas_lote(self, origem):
+        n = len(self.matriz)
+        m = self.num_formigas
+        atratividade = self.feromonio ** self.alfa * self.heuristica
+
+        rotas = np.empty((m, n + 1), dtype=np.intp)
+        rotas[:, 0] = origem
+        rotas[:, -1] = origem
+        visitados = np.zeros((m, n), dtype=bool)
+        visitados[:, origem] = True
+        formigas = np.arange(m)
+
+        atual = rotas[:, 0]
+        for passo in range(1, n):
+            proxima = self.escolher_proximas(atratividade, atual, visitados)
+            if self.variante == "ACS":
+                self.atualizar_feromonio_local(atual, proxima)
+                atratividade[atual, proxima] = (
+                    self.feromonio[atual, proxima] ** self.alfa * self.heuristica[atual, proxima]
+                )
+            rotas[:, passo] = proxima
+            visitados[formigas, proxima] = True
+            atual = proxima
+
+        distancias = self.matriz.distancias[rotas[:, :-1], rotas[:, 1:]].sum(axis=1)
+        return rotas, distancias
+
+    def atualizar_feromonio(self, rotas, distancias):
+        n = len(self.matriz)
+        self.feromonio *= (1 - self.rho)
+
+        origens = np.concatenate([rota[:-1] for rota in rotas])
+        destinos = np.concatenate([rota[1:] for rota in rotas])
+        depositos = np.concatenate([
+            np.full(len(rota) - 1, self.q / distancia) for rota, distancia in zip(rotas, distancias)
+        ])
+        self.feromonio += np.bincount(
+            origens * n + destinos, weights=depositos, minlength=n * n
+        ).reshape(n, n)
+
+    def atualizar_feromonio_local(self, origens, destinos):
+        self.feromonio[origens, destinos] *= (1 - self.xi)
+        self.feromonio[origens, destinos] += self.xi * self.tau0
+
+    def atualizar_feromonio_mmas(self, rota, distancia, melhor_distancia):
+        self.feromonio *= (1 - self.rho)
+        self.feromonio[rota[:-1], rota[1:]] += self.q / distancia
+
+        self.tau_max = self.q / (self.rho * melhor_distancia)
+        self.tau_min = self.tau_max / (2 * len(self.matriz))
+        np.clip(self.feromonio, self.tau_min, self.tau_max, out=self.feromonio)
+
+    def atualizar_feromonio_acs(self, rota, distancia):
+        origens, destinos = rota[:-1], rota[1:]
+        self.feromonio[origens, destinos] *= (1 - self.rho)
+        self.feromonio[origens, destinos] += self.rho * self.q / distancia
+
+    def receber_rota(self, rota, distancia):
+        if distancia < self.melhor_distancia:
+            self.melhor_rota = rota
+            self.melhor_distancia = distancia
+
+        self.feromonio[rota[:-1], rota[1:]] += self.q / distancia
+        if self.variante == "MMAS":
+            np.clip(self.feromonio, self.tau_min, self.tau_max, out=self.feromonio)
+
+    def executar_iteracao(self, origem_id, iteracao):
+        with fase("construcao"):
+            if self.vetorizado:
+                rotas, distancias = self.construir_rotas_lote(origem_id)
+            else:
+                rotas = [self.construir_rota(origem_id) for _ in range(self.num_formigas)]
+                distancias = [self.matriz.custo_rota(rota) for rota in rotas]
+
+        melhor_formiga = int(np.argmin(distancias))
+        if self.busca_local is not None:
+            with fase("busca_local"):
+                rotas[melhor_formiga], distancias[melhor_formiga] = self.busca_local.melhorar(rotas[melhor_formiga])
+        if distancias[melhor_formiga] < self.melhor_distancia:
+            self.melhor_rota = rotas[melhor_formiga]
+            self.melhor_distancia = float(distancias[melhor_formiga])
+
+        with fase("feromonio"):
+            if self.variante == "MMAS":
+                # Alterna o depósito da melhor formiga da iteração com o da melhor global
+                if (iteracao + 1) % self.intervalo_melhor_global == 0:
+                    self.atualizar_feromonio_mmas(self.melhor_rota, self.melhor_distancia, self.melhor_distancia)
+                else:
+                    self.atualizar_feromonio_mmas(
+                        rotas[melhor_formiga], distancias[melhor_formiga], self.melhor_distancia
+                    )
+            elif self.variante == "ACS":
+                self.atualizar_feromonio_acs(self.melhor_rota, self.melhor_distancia)
+            else:
+                self.atualizar_feromonio(rotas, distancias)
+
+        return rotas, distancias
 
     def executar(self, origem="Patrocínio"):
-        melhor_rota = None
-        melhor_distancia = float('inf')
-        todas_rotas_gerais = []
+        origem_id = self.matriz.indice[origem]
+        self.melhor_rota = None
+        self.melhor_distancia = float('inf')
+        top_rotas = TopRotas(self.num_top_rotas)
+
+        traco = TracoConvergencia(self.num_iteracoes)
 
         inicio = time.time()
+        inicio_ns = time.perf_counter_ns()
+        self.criterio_parada.iniciar()
+
+        iteracao = 0
+        while True:
+            rotas, distancias = self.executar_iteracao(origem_id, iteracao)
+            top_rotas.adicionar_lote(rotas, distancias)
+            iteracao += 1
 
-        for iteracao in range(self.num_iteracoes):
-            todas_rotas = []
-
-            for _ in range(self.num_formigas):
-                rota = [origem]
-                while len(rota) < len(self.grafo):
-                    proxima = self.escolher_proxima(rota[-1], rota)
-                    if proxima is None:
-                        break
-                    rota.append(proxima)
-                rota.append(origem)
-
-                distancia = 0
-                for i in range(len(rota) - 1):
-                    cidade = rota[i]
-                    destino = rota[i + 1]
-                    if destino in self.grafo.get(cidade, {}):
-                        distancia += self.grafo[cidade][destino]
-                    else:
-                        distancia += 9999
-
-                todas_rotas.append((rota, distancia))
-                todas_rotas_gerais.append((rota, distancia))
-
-                if distancia < melhor_distancia:
-                    melhor_rota = rota
-                    melhor_distancia = distancia
-
-            for cidade in self.feromonio:
-                for vizinho in self.feromonio[cidade]:
-                    self.feromonio[cidade][vizinho] *= (1 - self.rho)
-
-            for rota, distancia in todas_rotas:
-                for i in range(len(rota) - 1):
-                    cidade = rota[i]
-                    vizinho = rota[i + 1]
-                    if vizinho in self.feromonio.get(cidade, {}):
-                        self.feromonio[cidade][vizinho] += self.q / distancia
-
-            print(f"Iteração {iteracao + 1}: Melhor distância até agora = {melhor_distancia}")
+            traco.registrar(iteracao, self.melhor_distancia, np.min(distancias), np.mean(distancias),
+                            time.perf_counter_ns() - inicio_ns)
+            if self.observadores:
+                notificar(self.observadores, "ACO", traco)
+
+            if self.criterio_parada.verificar(iteracao, self.melhor_distancia):
+                break
 
         fim = time.time()
         tempo_execucao = fim - inicio
 
-        rotas_unicas = {}
-        for rota, dist in todas_rotas_gerais:
-            chave = tuple(rota)
-            if chave not in rotas_unicas or dist < rotas_unicas[chave]:
-                rotas_unicas[chave] = dist
-
-        top3 = sorted(rotas_unicas.items(), key=lambda x: x[1])[:3]
+        top3 = top_rotas.melhores()
 
         return {
-            "melhor_rota": top3[0][0],
+            "melhor_rota": self.matriz.nomes(top3[0][0]),
             "distancia": top3[0][1],
             "tempo": tempo_execucao,
-            "top3_rotas": [rota for rota, _ in top3]
+            "top3_rotas": [self.matriz.nomes(rota) for rota, _ in top3],
+            "iteracoes": iteracao,
+            "semente": self.semente,
+            "convergencia": traco.para_dict(),
+            **self.criterio_parada.resumo()
         }
@@ -0,0 +1,53 @@
+from algoritmos.aco import ACO
+from algoritmos.paralelo import CoordenadorMigracao
+from utils.matriz_distancias import anexar_matriz
+from utils.top_rotas import TopRotas
+
+
+def executar_colonia(descritor, semente, conexao, parametros, origem):
+    matriz, memoria = anexar_matriz(descritor)
+    aco = ACO(matriz, semente=semente, **parametros)
+    origem_id = matriz.indice[origem]
+    top_rotas = TopRotas(parametros.get("num_top_rotas", 3))
+    iteracao = 0
+
+    while True:
+        comando = conexao.recv()
+        if comando[0] == "finalizar":
+            break
+
+        _, num_iteracoes, migrante = comando
+        if migrante is not None:
+            aco.receber_rota(*migrante)
+
+        for _ in range(num_iteracoes):
+            rotas, distancias = aco.executar_iteracao(origem_id, iteracao)
+            iteracao += 1
+            top_rotas.adicionar_lote(rotas, distancias)
+
+        conexao.send(((aco.melhor_rota, aco.melhor_distancia), aco.melhor_distancia))
+
+    conexao.send(top_rotas)
+    conexao.close()
+    del matriz, aco
+    memoria.close()
+
+
+def migrar_em_anel(melhores):
+    # Cada colônia recebe a melhor rota da anterior
+    return [melhores[i - 1] for i in range(len(melhores))]
+
+
+class ACOMultiColonia(CoordenadorMigracao):
+    rotulo = "ACO"
+    nome_processo = "colônia"
+
+    def __init__(self, grafo, num_colonias=4, intervalo_migracao=10, num_iteracoes=100, semente=None,
+                 **parametros):
+        super().__init__(grafo, num_colonias, intervalo_migracao, num_iteracoes, semente, parametros)
+        self.num_colonias = num_colonias
+        self.parametros = dict(self.parametros, num_iteracoes=num_iteracoes)
+
+    def executar(self, origem="Patrocínio"):
+        return self.coordenar(executar_colonia, (self.parametros, origem), migrar_em_anel,
+                              [None] * self.num_colonias)
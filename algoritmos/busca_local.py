@@ -0,0 +1,135 @@
+from collections import deque
+
+import numpy as np
+
+from utils.matriz_distancias import MatrizDistancias
+
+EPSILON = 1e-9
+
+
+class BuscaLocal:
+    # Supõe distâncias simétricas, como as do fechamento métrico de um grafo não direcionado
+    def __init__(self, grafo, num_vizinhos=10, max_segmento=3):
+        self.matriz = MatrizDistancias.de_grafo(grafo)
+        self.distancias = self.matriz.distancias.tolist()
+        self.vizinhos = self.matriz.vizinhos_proximos(num_vizinhos).tolist()
+        self.max_segmento = max_segmento
+
+    def melhorar(self, rota):
+        origem = int(rota[0])
+        tour = [int(cidade) for cidade in rota[:-1]]
+        if len(tour) < 5:
+            return np.array(rota, dtype=np.intp), self.matriz.custo_rota(rota)
+
+        pos = [-1] * len(self.distancias)
+        for i, cidade in enumerate(tour):
+            pos[cidade] = i
+
+        # Bits "don't look": só cidades na fila são examinadas de novo
+        fila = deque(tour)
+        na_fila = [False] * len(self.distancias)
+        for cidade in tour:
+            na_fila[cidade] = True
+
+        while fila:
+            a = fila.popleft()
+            na_fila[a] = False
+            alteradas = self.mover_dois_opt(tour, pos, a) or self.mover_or_opt(tour, pos, a)
+            for cidade in alteradas:
+                if not na_fila[cidade]:
+                    fila.append(cidade)
+                    na_fila[cidade] = True
+
+        inicio = pos[origem]
+        melhorada = np.array(tour[inicio:] + tour[:inicio] + [origem], dtype=np.intp)
+        return melhorada, self.matriz.custo_rota(melhorada)
+
+    def inverter(self, tour, pos, i, j):
+        n = len(tour)
+        comprimento = (j - i) % n + 1
+        if 2 * comprimento > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            comprimento = n - comprimento
+
+        for _ in range(comprimento // 2):
+            cidade_i, cidade_j = tour[i], tour[j]
+            tour[i], tour[j] = cidade_j, cidade_i
+            pos[cidade_j], pos[cidade_i] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def mover_dois_opt(self, tour, pos, a):
+        n = len(tour)
+        d = self.distancias
+
+        for sentido in (1, -1):
+            i = pos[a]
+            b = tour[(i + sentido) % n]
+            d_ab = d[a][b]
+
+            for c in self.vizinhos[a]:
+                d_ac = d[a][c]
+                if d_ac >= d_ab:
+                    break
+                j = pos[c]
+                if j < 0:
+                    continue
+                e = tour[(j + sentido) % n]
+                if c == b or e == a:
+                    continue
+
+                if d_ac + d[b][e] - d_ab - d[c][e] < -EPSILON:
+                    if sentido == 1:
+                        self.inverter(tour, pos, pos[b], j)
+                    else:
+                        self.inverter(tour, pos, j, pos[b])
+                    return [a, b, c, e]
+        return []
+
+    def mover_or_opt(self, tour, pos, a):
+        n = len(tour)
+        d = self.distancias
+        i = pos[a]
+
+        for tamanho in range(1, min(self.max_segmento, n - 3) + 1):
+            segmento = [tour[(i + t) % n] for t in range(tamanho)]
+            s1, s2 = segmento[0], segmento[-1]
+            anterior = tour[(i - 1) % n]
+            seguinte = tour[(i + tamanho) % n]
+
+            ganho_remocao = d[anterior][s1] + d[s2][seguinte] - d[anterior][seguinte]
+            if ganho_remocao <= EPSILON:
+                continue
+
+            no_segmento = set(segmento)
+            for ponta, outra in ((s1, s2), (s2, s1)):
+                for c in self.vizinhos[ponta]:
+                    if d[ponta][c] >= ganho_remocao:
+                        break
+                    if pos[c] < 0 or c in no_segmento:
+                        continue
+
+                    # A ponta fica colada em c, com c à esquerda ou à direita do segmento
+                    for x, y, esquerda in (
+                        (c, tour[(pos[c] + 1) % n], ponta),
+                        (tour[(pos[c] - 1) % n], c, outra),
+                    ):
+                        if x in no_segmento or y in no_segmento:
+                            continue
+                        direita = outra if esquerda == ponta else ponta
+                        custo_insercao = d[x][esquerda] + d[direita][y] - d[x][y]
+                        if custo_insercao < ganho_remocao - EPSILON:
+                            self.mover_segmento(tour, pos, segmento, x, esquerda != s1)
+                            return [anterior, seguinte, s1, s2, x, y]
+        return []
+
+    def mover_segmento(self, tour, pos, segmento, x, invertido):
+        no_segmento = set(segmento)
+        if invertido:
+            segmento = segmento[::-1]
+
+        resto = [cidade for cidade in tour if cidade not in no_segmento]
+        k = resto.index(x) + 1
+        tour[:] = resto[:k] + segmento + resto[k:]
+        for i, cidade in enumerate(tour):
+            pos[cidade] = i
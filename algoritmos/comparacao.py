@@ -0,0 +1,90 @@
+import multiprocessing as mp
+import queue
+import time
+
+from algoritmos.registro import SOLVERS, criar_solver
+from utils.matriz_distancias import MatrizDistancias, MatrizCompartilhada, anexar_matriz
+from utils.perfil import ativar_perfil, desativar_perfil, fase, perfil_ativo
+
+
+def resolver_no_processo(matriz, nome, opcoes, orcamento, fila, cancelamento, com_progresso):
+    observadores = []
+    if com_progresso:
+        observadores.append(lambda progresso: fila.put(("progresso", nome, progresso)))
+    solver = criar_solver(nome, matriz, observadores=observadores, cancelamento=cancelamento, **opcoes)
+    return solver.resolver(orcamento)
+
+
+def executar_solver(descritor, nome, opcoes, orcamento, fila, cancelamento, com_progresso, com_perfil):
+    inicio = time.perf_counter()
+    matriz, memoria = anexar_matriz(descritor)
+    # O perfil do processo pai não é visto aqui: cada filho mede o seu e envia as fases de volta
+    perfil = ativar_perfil() if com_perfil else desativar_perfil()
+    try:
+        with fase(SOLVERS[nome].rotulo):
+            resultado = resolver_no_processo(matriz, nome, opcoes, orcamento, fila, cancelamento, com_progresso)
+        resultado.tempo_processo = time.perf_counter() - inicio
+        if com_perfil:
+            fila.put(("perfil", nome, perfil.fases))
+        fila.put(("resultado", nome, resultado))
+    except Exception as erro:
+        fila.put(("erro", nome, f"{type(erro).__name__}: {erro}"))
+    finally:
+        del matriz
+        memoria.close()
+
+
+def comparar_em_paralelo(grafo, solvers, orcamento=None, observadores=(), cancelamento=None):
+    # `solvers` é uma lista de (nome no registro, opções do solver); todos leem a mesma matriz compartilhada
+    matriz = MatrizDistancias.de_grafo(grafo)
+    fila = mp.Queue()
+    cancelamento_processos = mp.Event()
+    resultados = {}
+    erros = {}
+    perfil = perfil_ativo()
+
+    with MatrizCompartilhada(matriz) as compartilhada:
+        processos = {}
+        for nome, opcoes in solvers:
+            processo = mp.Process(
+                target=executar_solver,
+                args=(compartilhada.descritor, nome, opcoes, orcamento, fila, cancelamento_processos,
+                      bool(observadores), perfil is not None),
+                # Não-daemon: solvers como ACOMultiColonia abrem seus próprios processos
+                daemon=False,
+            )
+            processo.start()
+            processos[nome] = processo
+
+        pendentes = set(processos)
+        while pendentes:
+            # Repassa o cancelamento (threading.Event, por exemplo) para os processos filhos
+            if cancelamento is not None and cancelamento.is_set():
+                cancelamento_processos.set()
+            try:
+                tipo, nome, dados = fila.get(timeout=0.1)
+            except queue.Empty:
+                for nome in list(pendentes):
+                    if not processos[nome].is_alive() and fila.empty():
+                        erros[nome] = f"processo terminou com código {processos[nome].exitcode}"
+                        pendentes.discard(nome)
+                continue
+
+            if tipo == "progresso":
+                for observador in observadores:
+                    observador(dados)
+            elif tipo == "perfil":
+                perfil.juntar(dados)
+            elif tipo == "resultado":
+                resultados[nome] = dados
+                pendentes.discard(nome)
+            else:
+                erros[nome] = dados
+                pendentes.discard(nome)
+
+        for processo in processos.values():
+            processo.join()
+
+    if erros:
+        raise RuntimeError("; ".join(f"{nome}: {erro}" for nome, erro in erros.items()))
+    return resultados
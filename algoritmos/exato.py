@@ -0,0 +1,230 @@
+import time
+
+import numpy as np
+
+from algoritmos.busca_local import BuscaLocal
+from utils.matriz_distancias import MatrizDistancias
+
+EPSILON = 1e-9
+# Até aqui o Held–Karp resolve em frações de segundo; acima, o branch-and-bound pode levar minutos
+LIMITE_DP = 15
+
+
+def arvore_geradora_minima(custos):
+    k = len(custos)
+    graus = np.zeros(k, dtype=np.intp)
+    if k <= 1:
+        return 0.0, graus
+
+    na_arvore = np.zeros(k, dtype=bool)
+    na_arvore[0] = True
+    melhor = custos[0].copy()
+    pai = np.zeros(k, dtype=np.intp)
+    total = 0.0
+
+    for _ in range(k - 1):
+        v = int(np.argmin(np.where(na_arvore, np.inf, melhor)))
+        total += melhor[v]
+        graus[v] += 1
+        graus[pai[v]] += 1
+        na_arvore[v] = True
+
+        atualizar = ~na_arvore & (custos[v] < melhor)
+        melhor[atualizar] = custos[v][atualizar]
+        pai[atualizar] = v
+
+    return total, graus
+
+
+def um_arvore(distancias, pi, especial):
+    custos = distancias + pi[:, None] + pi[None, :]
+    outros = np.array([i for i in range(len(distancias)) if i != especial], dtype=np.intp)
+
+    total, graus_outros = arvore_geradora_minima(custos[np.ix_(outros, outros)])
+    ligacoes = custos[especial, outros]
+    duas = np.argpartition(ligacoes, 1)[:2]
+    total += ligacoes[duas].sum()
+
+    graus = np.zeros(len(distancias), dtype=np.intp)
+    graus[outros] = graus_outros
+    graus[outros[duas]] += 1
+    graus[especial] = 2
+    return total - 2 * pi.sum(), graus
+
+
+def arredondar_limite(limite, inteira):
+    # Com custos inteiros o ótimo também é inteiro, então o limite pode subir para o inteiro seguinte
+    # (a folga absorve o erro de ponto flutuante acumulado nos multiplicadores)
+    return float(np.ceil(limite - 1e-6)) if inteira else float(limite)
+
+
+def limite_inferior(grafo, limite_superior=None, max_iteracoes=200, especial=0):
+    matriz = MatrizDistancias.de_grafo(grafo)
+    distancias = matriz.distancias
+    n = len(matriz)
+    if n < 3:
+        return matriz.custo_rota(matriz.rota_gulosa(especial)), np.zeros(n)
+    if limite_superior is None:
+        limite_superior = matriz.custo_rota(matriz.rota_gulosa(especial))
+
+    inteira = bool(np.all(distancias == np.round(distancias)))
+
+    # Relaxação lagrangiana de Held–Karp com otimização por subgradiente
+    pi = np.zeros(n)
+    melhor_limite, melhor_pi = -np.inf, pi.copy()
+    passo = 2.0
+    sem_melhora = 0
+
+    for _ in range(max_iteracoes):
+        limite, graus = um_arvore(distancias, pi, especial)
+        if limite > melhor_limite + EPSILON:
+            melhor_limite, melhor_pi = limite, pi.copy()
+            sem_melhora = 0
+        else:
+            sem_melhora += 1
+            if sem_melhora >= 10:
+                passo /= 2
+                sem_melhora = 0
+
+        subgradiente = graus - 2
+        norma = float((subgradiente ** 2).sum())
+        if norma == 0 or passo < 1e-6 or arredondar_limite(melhor_limite, inteira) >= limite_superior - EPSILON:
+            break
+        pi = pi + passo * (limite_superior - limite) / norma * subgradiente
+
+    return arredondar_limite(melhor_limite, inteira), melhor_pi
+
+
+def held_karp(distancias, origem):
+    n = len(distancias)
+    outros = np.array([i for i in range(n) if i != origem], dtype=np.intp)
+    m = len(outros)
+    d = distancias[np.ix_(outros, outros)]
+
+    custo = np.full((1 << m, m), np.inf)
+    pai = np.full((1 << m, m), -1, dtype=np.int8 if m < 127 else np.intp)
+    for j in range(m):
+        custo[1 << j, j] = distancias[origem, outros[j]]
+
+    mascaras = np.arange(1 << m)
+    tamanhos = np.zeros(1 << m, dtype=np.intp)
+    for j in range(m):
+        tamanhos += (mascaras >> j) & 1
+
+    # Processa os subconjuntos por cardinalidade, vetorizando sobre todas as máscaras do nível
+    for tamanho in range(2, m + 1):
+        nivel = mascaras[tamanhos == tamanho]
+        for j in range(m):
+            com_j = nivel[(nivel >> j) & 1 == 1]
+            anteriores = com_j ^ (1 << j)
+            candidatos = custo[anteriores] + d[:, j]
+            escolhidos = np.argmin(candidatos, axis=1)
+            custo[com_j, j] = candidatos[np.arange(len(com_j)), escolhidos]
+            pai[com_j, j] = escolhidos
+
+    completa = (1 << m) - 1
+    totais = custo[completa] + distancias[outros, origem]
+    j = int(np.argmin(totais))
+    melhor = float(totais[j])
+
+    caminho = []
+    mascara = completa
+    while j >= 0:
+        caminho.append(outros[j])
+        anterior = int(pai[mascara, j])
+        mascara ^= 1 << j
+        j = anterior
+    rota = np.array([origem] + caminho[::-1] + [origem], dtype=np.intp)
+    return rota, melhor
+
+
+def branch_and_bound(distancias, origem, rota_inicial, pi, tempo_limite=None, cancelamento=None):
+    # Devolve (rota, custo, motivo); interrompida por tempo ou cancelamento, a rota é só a melhor até ali
+    n = len(distancias)
+    custos = distancias + pi[:, None] + pi[None, :]
+    melhor = {"rota": rota_inicial, "custo": float(distancias[rota_inicial[:-1], rota_inicial[1:]].sum()),
+              "motivo": "otimo"}
+    prazo = None if tempo_limite is None else time.perf_counter() + tempo_limite
+    # Com distâncias inteiras, qualquer rota melhor custa ao menos uma unidade a menos
+    folga = 1 - EPSILON if np.all(distancias == np.round(distancias)) else EPSILON
+    visitados = np.zeros(n, dtype=bool)
+    visitados[origem] = True
+    caminho = [origem]
+
+    def explorar(atual, custo):
+        if melhor["motivo"] != "otimo":
+            return
+        if cancelamento is not None and cancelamento.is_set():
+            melhor["motivo"] = "cancelado"
+            return
+        if prazo is not None and time.perf_counter() > prazo:
+            melhor["motivo"] = "tempo_limite"
+            return
+
+        restantes = np.flatnonzero(~visitados)
+        if len(restantes) == 0:
+            total = custo + distancias[atual, origem]
+            if total < melhor["custo"] - EPSILON:
+                melhor["rota"] = np.array(caminho + [origem], dtype=np.intp)
+                melhor["custo"] = float(total)
+            return
+
+        # O que falta (atual -> restantes -> origem) é uma árvore geradora dos restantes
+        # mais uma aresta saindo de `atual` e outra chegando na origem, como numa 1-árvore
+        arvore, _ = arvore_geradora_minima(custos[np.ix_(restantes, restantes)])
+        if atual == origem:
+            saidas = custos[origem, restantes]
+            ligacoes = np.partition(saidas, 1)[:2].sum() if len(restantes) > 1 else 2 * saidas[0]
+        else:
+            ligacoes = custos[atual, restantes].min() + custos[restantes, origem].min()
+        limite = custo + arvore + ligacoes - pi[atual] - pi[origem] - 2 * pi[restantes].sum()
+        if limite > melhor["custo"] - folga:
+            return
+
+        for proxima in restantes[np.argsort(distancias[atual, restantes])]:
+            visitados[proxima] = True
+            caminho.append(int(proxima))
+            explorar(int(proxima), custo + distancias[atual, proxima])
+            caminho.pop()
+            visitados[proxima] = False
+
+    explorar(origem, 0.0)
+    return melhor["rota"], melhor["custo"], melhor["motivo"]
+
+
+def resolver_exato(grafo, origem="Patrocínio", limite_dp=LIMITE_DP, rota_inicial=None, tempo_limite=None,
+                   cancelamento=None):
+    matriz = MatrizDistancias.de_grafo(grafo)
+    origem_id = matriz.indice[origem]
+    n = len(matriz)
+    inicio = time.time()
+    motivo = "otimo"
+
+    if n <= 3:
+        rota = np.array([origem_id] + [i for i in range(n) if i != origem_id] + [origem_id], dtype=np.intp)
+        distancia = matriz.custo_rota(rota)
+    elif n <= limite_dp:
+        rota, distancia = held_karp(matriz.distancias, origem_id)
+    else:
+        if rota_inicial is None:
+            rota_inicial, _ = BuscaLocal(matriz).melhorar(matriz.rota_gulosa(origem_id))
+        else:
+            rota_inicial = matriz.ids(rota_inicial)
+        _, pi = limite_inferior(matriz, matriz.custo_rota(rota_inicial), especial=origem_id)
+        rota, distancia, motivo = branch_and_bound(
+            matriz.distancias, origem_id, rota_inicial, pi, tempo_limite, cancelamento
+        )
+
+    return {
+        "melhor_rota": matriz.nomes(rota),
+        "distancia": distancia,
+        "tempo": time.time() - inicio,
+        "top3_rotas": [matriz.nomes(rota)],
+        "motivo_parada": motivo
+    }
+
+
+def calcular_gap(distancia, limite):
+    if limite <= 0:
+        return 0.0
+    return 100 * (distancia - limite) / limite
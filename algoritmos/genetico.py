@@ -1,110 +1,185 @@
-import random
 import time
 
+import numpy as np
+
+from algoritmos import operadores
+from algoritmos.busca_local import BuscaLocal
+from utils.matriz_distancias import MatrizDistancias
+from utils.perfil import fase
+from utils.convergencia import TracoConvergencia, notificar
+from utils.criterio_parada import CriterioParada
+from utils.top_rotas import TopRotas
+
 
 class AlgoritmoGenetico:
-    def __init__(self, grafo, tamanho_populacao=50, taxa_mutacao=0.01, num_geracoes=100, origem="Patrocínio"):
-        self.grafo = grafo
+    def __init__(self, grafo, tamanho_populacao=50, taxa_mutacao=0.01, num_geracoes=100, origem="Patrocínio",
+                 num_top_rotas=3, tipo_crossover="ox", tipo_mutacao="troca", busca_local=False,
+                 limite_inferior=None, max_estagnacao=None, custo_alvo=None, tempo_limite=None,
+                 observadores=None, semente=None, cancelamento=None):
+        if tipo_crossover not in operadores.CROSSOVERS:
+            raise ValueError(f"Crossover desconhecido: {tipo_crossover}")
+        if tipo_mutacao not in operadores.MUTACOES:
+            raise ValueError(f"Mutação desconhecida: {tipo_mutacao}")
+
+        self.matriz = MatrizDistancias.de_grafo(grafo)
         self.tamanho_populacao = tamanho_populacao
         self.taxa_mutacao = taxa_mutacao
         self.num_geracoes = num_geracoes
         self.origem = origem
-        self.cidades = list(grafo.keys())
-        self.cidades.remove(self.origem)
+        self.num_top_rotas = num_top_rotas
+        self.tipo_crossover = tipo_crossover
+        self.tipo_mutacao = tipo_mutacao
+        # Gerador próprio: a semente (inteiro ou SeedSequence) reproduz a execução
+        self.semente = np.random.SeedSequence().entropy if semente is None else semente
+        self.rng = np.random.default_rng(self.semente)
+        self.busca_local = BuscaLocal(self.matriz) if busca_local else None
+        self.limite_inferior = limite_inferior
+        self.observadores = list(observadores or [])
+        self.criterio_parada = CriterioParada(num_geracoes, max_estagnacao, custo_alvo, tempo_limite,
+                                              limite_inferior, cancelamento)
+        self.origem_id = self.matriz.indice[origem]
+        self.cidades = np.array(
+            [i for i in range(len(self.matriz)) if i != self.origem_id], dtype=np.intp
+        )
 
     def criar_rota(self):
-        rota = self.cidades.copy()
-        random.shuffle(rota)
-        return [self.origem] + rota + [self.origem]
+        rota = np.empty(len(self.cidades) + 2, dtype=np.intp)
+        rota[0] = rota[-1] = self.origem_id
+        rota[1:-1] = self.rng.permutation(self.cidades)
+        return rota
 
     def criar_populacao(self):
-        return [self.criar_rota() for _ in range(self.tamanho_populacao)]
+        populacao = np.empty((self.tamanho_populacao, len(self.cidades) + 2), dtype=np.intp)
+        populacao[:, 0] = populacao[:, -1] = self.origem_id
+        ordens = np.argsort(self.rng.random((self.tamanho_populacao, len(self.cidades))), axis=1)
+        populacao[:, 1:-1] = self.cidades[ordens]
+        return populacao
 
     def calcular_distancia(self, rota):
-        distancia = 0
-        for i in range(len(rota) - 1):
-            origem = rota[i]
-            destino = rota[i + 1]
-            distancia += self.grafo[origem][destino]
-        return distancia
+        return self.matriz.custo_rota(rota)
 
-    def rankear_rotas(self, populacao):
-        return sorted(populacao, key=lambda x: self.calcular_distancia(x))
+    def calcular_distancias(self, populacao):
+        return self.matriz.distancias[populacao[:, :-1], populacao[:, 1:]].sum(axis=1)
+
+    def rankear_rotas(self, populacao, custos):
+        ordem = np.argsort(custos, kind='stable')
+        return populacao[ordem], custos[ordem]
 
     def selecao(self, populacao_rankeada):
         return populacao_rankeada[:int(0.2 * self.tamanho_populacao)]
 
     def crossover(self, pai1, pai2):
-        pai1_meio = pai1[1:-1]
-        pai2_meio = pai2[1:-1]
-
-        start = random.randint(0, len(pai1_meio) - 2)
-        end = random.randint(start + 1, len(pai1_meio) - 1)
-
-        filho_p1 = pai1_meio[start:end]
-        filho_p2 = [cidade for cidade in pai2_meio if cidade not in filho_p1]
-
-        filho = [self.origem] + filho_p2[:start] + filho_p1 + filho_p2[start:] + [self.origem]
+        filho = np.empty_like(pai1)
+        filho[0] = filho[-1] = self.origem_id
+        filho[1:-1] = operadores.cruzar(
+            pai1[1:-1], pai2[1:-1], self.tipo_crossover, self.rng, len(self.matriz)
+        )
         return filho
 
     def mutacao(self, rota):
-        rota_meio = rota[1:-1]
-        for i in range(len(rota_meio)):
-            if random.random() < self.taxa_mutacao:
-                j = random.randint(0, len(rota_meio) - 1)
-                rota_meio[i], rota_meio[j] = rota_meio[j], rota_meio[i]
-        return [self.origem] + rota_meio + [self.origem]
-
-    def gerar_nova_geracao(self, populacao_atual):
-        populacao_rankeada = self.rankear_rotas(populacao_atual)
+        rota = rota.copy()
+        operadores.mutar(rota[1:-1], self.tipo_mutacao, self.taxa_mutacao, self.rng)
+        return rota
+
+    def gerar_filhos(self, elite, quantidade):
+        pais1 = elite[self.rng.integers(len(elite), size=quantidade)]
+        pais2 = elite[self.rng.integers(len(elite), size=quantidade)]
+
+        filhos = np.empty((quantidade, elite.shape[1]), dtype=np.intp)
+        filhos[:, 0] = filhos[:, -1] = self.origem_id
+        with fase("crossover"):
+            filhos[:, 1:-1] = operadores.cruzar_lote(
+                pais1[:, 1:-1], pais2[:, 1:-1], self.tipo_crossover, self.rng, len(self.matriz)
+            )
+        with fase("mutacao"):
+            operadores.mutar_lote(filhos[:, 1:-1], self.tipo_mutacao, self.taxa_mutacao, self.rng)
+        return filhos
+
+    def gerar_nova_geracao(self, populacao_rankeada, custos):
         elite = self.selecao(populacao_rankeada)
+        filhos = self.gerar_filhos(elite, self.tamanho_populacao - len(elite))
+
+        # Só os filhos são avaliados; a elite carrega o custo da geração anterior
+        with fase("avaliacao"):
+            custos_filhos = self.calcular_distancias(filhos)
+        if self.busca_local is not None and len(filhos):
+            melhor_filho = int(np.argmin(custos_filhos))
+            with fase("busca_local"):
+                filhos[melhor_filho], custos_filhos[melhor_filho] = self.busca_local.melhorar(filhos[melhor_filho])
+
+        with fase("ranking"):
+            nova_geracao = np.concatenate((elite, filhos))
+            novos_custos = np.concatenate((custos[:len(elite)], custos_filhos))
+            return self.rankear_rotas(nova_geracao, novos_custos)
+
+    def iniciar(self):
+        populacao = self.criar_populacao()
+        self.populacao, self.custos = self.rankear_rotas(populacao, self.calcular_distancias(populacao))
+        self.melhor_rota = None
+        self.melhor_distancia = float('inf')
+
+    def executar_geracao(self):
+        self.populacao, self.custos = self.gerar_nova_geracao(self.populacao, self.custos)
 
-        filhos = []
-        while len(filhos) < self.tamanho_populacao - len(elite):
-            pai1 = random.choice(elite)
-            pai2 = random.choice(elite)
-            filho = self.crossover(pai1, pai2)
-            filho = self.mutacao(filho)
-            filhos.append(filho)
+        if self.custos[0] < self.melhor_distancia:
+            self.melhor_rota = self.populacao[0].copy()
+            self.melhor_distancia = float(self.custos[0])
 
-        nova_geracao = elite + filhos
-        return nova_geracao
+        return self.populacao, self.custos
+
+    def melhores_individuos(self, quantidade):
+        return list(self.populacao[:quantidade]), [float(custo) for custo in self.custos[:quantidade]]
+
+    def receber_migrantes(self, migrantes):
+        if not len(migrantes):
+            return
+        migrantes = np.array(migrantes, dtype=np.intp)[:len(self.populacao)]
+        custos_migrantes = self.calcular_distancias(migrantes)
+
+        manter = len(self.populacao) - len(migrantes)
+        populacao = np.concatenate((self.populacao[:manter], migrantes))
+        custos = np.concatenate((self.custos[:manter], custos_migrantes))
+        self.populacao, self.custos = self.rankear_rotas(populacao, custos)
+
+        if self.custos[0] < self.melhor_distancia:
+            self.melhor_rota = self.populacao[0].copy()
+            self.melhor_distancia = float(self.custos[0])
 
     def executar(self):
         inicio = time.time()
+        inicio_ns = time.perf_counter_ns()
 
-        populacao = self.criar_populacao()
-        melhor_rota = None
-        melhor_distancia = float('inf')
-        todas_rotas = []
-
-        for geracao in range(self.num_geracoes):
-            populacao = self.gerar_nova_geracao(populacao)
-            populacao_rankeada = self.rankear_rotas(populacao)
+        self.iniciar()
+        top_rotas = TopRotas(self.num_top_rotas)
+        traco = TracoConvergencia(self.num_geracoes)
+        self.criterio_parada.iniciar()
 
-            distancia_atual = self.calcular_distancia(populacao_rankeada[0])
-            todas_rotas.extend([(ind, self.calcular_distancia(ind)) for ind in populacao_rankeada])
+        geracao = 0
+        while True:
+            populacao_rankeada, custos = self.executar_geracao()
+            top_rotas.adicionar_lote(populacao_rankeada, custos)
+            geracao += 1
 
-            if distancia_atual < melhor_distancia:
-                melhor_rota = populacao_rankeada[0]
-                melhor_distancia = distancia_atual
+            traco.registrar(geracao, self.melhor_distancia, custos[0], custos.mean(),
+                            time.perf_counter_ns() - inicio_ns)
+            if self.observadores:
+                notificar(self.observadores, "Genético", traco)
 
-            print(f"Geração {geracao + 1}: Melhor distância = {melhor_distancia}")
+            if self.criterio_parada.verificar(geracao, self.melhor_distancia):
+                break
 
         fim = time.time()
         tempo_execucao = fim - inicio
 
-        rotas_unicas = {}
-        for rota, dist in todas_rotas:
-            chave = tuple(rota)
-            if chave not in rotas_unicas or dist < rotas_unicas[chave]:
-                rotas_unicas[chave] = dist
-
-        top3 = sorted(rotas_unicas.items(), key=lambda x: x[1])[:3]
+        top3 = top_rotas.melhores()
 
         return {
-            "melhor_rota": top3[0][0],
+            "melhor_rota": self.matriz.nomes(top3[0][0]),
             "distancia": top3[0][1],
             "tempo": tempo_execucao,
-            "top3_rotas": [rota for rota, _ in top3]
+            "top3_rotas": [self.matriz.nomes(rota) for rota, _ in top3],
+            "iteracoes": geracao,
+            "semente": self.semente,
+            "convergencia": traco.para_dict(),
+            **self.criterio_parada.resumo()
         }
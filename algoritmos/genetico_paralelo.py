@@ -0,0 +1,73 @@
+from functools import partial
+
+from algoritmos.genetico import AlgoritmoGenetico
+from algoritmos.paralelo import CoordenadorMigracao
+from utils.matriz_distancias import anexar_matriz
+from utils.top_rotas import TopRotas
+
+TOPOLOGIAS = ("anel", "completa")
+
+
+def executar_ilha(descritor, semente, conexao, parametros, num_migrantes):
+    matriz, memoria = anexar_matriz(descritor)
+    ga = AlgoritmoGenetico(matriz, semente=semente, **parametros)
+    ga.iniciar()
+    top_rotas = TopRotas(parametros.get("num_top_rotas", 3))
+
+    while True:
+        comando = conexao.recv()
+        if comando[0] == "finalizar":
+            break
+
+        _, num_geracoes, migrantes = comando
+        ga.receber_migrantes(migrantes)
+
+        for _ in range(num_geracoes):
+            populacao, custos = ga.executar_geracao()
+            top_rotas.adicionar_lote(populacao, custos)
+
+        conexao.send((ga.melhores_individuos(num_migrantes), ga.melhor_distancia))
+
+    conexao.send(top_rotas)
+    conexao.close()
+    del matriz, ga
+    memoria.close()
+
+
+def distribuir_migrantes(emigrantes, topologia, num_migrantes):
+    num_ilhas = len(emigrantes)
+    if topologia == "anel":
+        return [emigrantes[i - 1][0] for i in range(num_ilhas)]
+
+    migrantes = []
+    for i in range(num_ilhas):
+        candidatos = [
+            (distancia, j, k)
+            for j, (_, distancias) in enumerate(emigrantes) if j != i
+            for k, distancia in enumerate(distancias)
+        ]
+        candidatos.sort()
+        migrantes.append([emigrantes[j][0][k] for _, j, k in candidatos[:num_migrantes]])
+    return migrantes
+
+
+class AlgoritmoGeneticoIlhas(CoordenadorMigracao):
+    rotulo = "Genético"
+    nome_processo = "ilha"
+
+    def __init__(self, grafo, num_ilhas=4, intervalo_migracao=10, num_migrantes=2, topologia="anel",
+                 num_geracoes=100, semente=None, **parametros):
+        if topologia not in TOPOLOGIAS:
+            raise ValueError(f"Topologia de migração desconhecida: {topologia}")
+
+        super().__init__(grafo, num_ilhas, intervalo_migracao, num_geracoes, semente, parametros)
+        self.num_ilhas = num_ilhas
+        self.num_migrantes = num_migrantes
+        self.topologia = topologia
+        self.num_geracoes = num_geracoes
+        self.parametros = dict(self.parametros, num_geracoes=num_geracoes)
+
+    def executar(self):
+        migrar = partial(distribuir_migrantes, topologia=self.topologia, num_migrantes=self.num_migrantes)
+        return self.coordenar(executar_ilha, (self.parametros, self.num_migrantes), migrar,
+                              [[] for _ in range(self.num_ilhas)])
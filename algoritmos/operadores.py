@@ -0,0 +1,164 @@
+import numpy as np
+
+# Os operadores trabalham só no miolo da rota (sem o depósito nas pontas),
+# sobre permutações de ids inteiros menores que `tamanho_ids`.
+
+
+def sortear_cortes(rng, tamanho, quantidade=None):
+    inicio = rng.integers(0, tamanho - 1, size=quantidade)
+    fim = inicio + 1 + (rng.random(size=quantidade) * (tamanho - 1 - inicio)).astype(np.intp)
+    return inicio, fim
+
+
+def crossover_ox(pai1, pai2, inicio, fim, tamanho_ids):
+    segmento = pai1[inicio:fim]
+    no_segmento = np.zeros(tamanho_ids, dtype=bool)
+    no_segmento[segmento] = True
+    resto = pai2[~no_segmento[pai2]]
+    return np.concatenate((resto[:inicio], segmento, resto[inicio:]))
+
+
+def crossover_pmx(pai1, pai2, inicio, fim, tamanho_ids):
+    filho = pai2.copy()
+    posicoes = np.empty(tamanho_ids, dtype=np.intp)
+    posicoes[filho] = np.arange(len(filho))
+
+    for i in range(inicio, fim):
+        cidade = pai1[i]
+        j = posicoes[cidade]
+        deslocada = filho[i]
+        filho[i], filho[j] = cidade, deslocada
+        posicoes[cidade], posicoes[deslocada] = i, j
+    return filho
+
+
+def crossover_erx(pai1, pai2, rng):
+    pai1 = pai1.tolist()
+    pai2 = pai2.tolist()
+    tamanho = len(pai1)
+
+    vizinhos = {cidade: set() for cidade in pai1}
+    for pai in (pai1, pai2):
+        for i, cidade in enumerate(pai):
+            vizinhos[cidade].add(pai[i - 1])
+            vizinhos[cidade].add(pai[(i + 1) % tamanho])
+
+    pendentes = list(pai1)
+    posicao = {cidade: i for i, cidade in enumerate(pendentes)}
+
+    filho = []
+    atual = pai1[0] if rng.random() < 0.5 else pai2[0]
+    while True:
+        filho.append(atual)
+        # Remoção O(1): troca com o último da lista de pendentes
+        i = posicao.pop(atual)
+        ultimo = pendentes.pop()
+        if ultimo != atual:
+            pendentes[i] = ultimo
+            posicao[ultimo] = i
+        for vizinho in vizinhos[atual]:
+            vizinhos[vizinho].discard(atual)
+
+        if len(filho) == tamanho:
+            break
+        if vizinhos[atual]:
+            atual = min(vizinhos[atual], key=lambda cidade: (len(vizinhos[cidade]), rng.random()))
+        else:
+            atual = pendentes[rng.integers(len(pendentes))]
+
+    return np.array(filho, dtype=np.intp)
+
+
+def mutacao_troca(meio, taxa, rng):
+    for i in np.flatnonzero(rng.random(len(meio)) < taxa):
+        j = rng.integers(len(meio))
+        meio[i], meio[j] = meio[j], meio[i]
+
+
+def mutacao_inversao(meio, rng):
+    i, j = np.sort(rng.integers(len(meio), size=2))
+    meio[i:j + 1] = meio[i:j + 1][::-1]
+
+
+def mutacao_or_opt(meio, rng, maximo_segmento=3):
+    if len(meio) < 2:
+        return
+    tamanho_segmento = int(rng.integers(1, min(maximo_segmento, len(meio) - 1) + 1))
+    i = int(rng.integers(len(meio) - tamanho_segmento + 1))
+    j = int(rng.integers(len(meio) - tamanho_segmento + 1))
+    if j > i:
+        meio[i:j + tamanho_segmento] = np.roll(meio[i:j + tamanho_segmento], -tamanho_segmento)
+    elif j < i:
+        meio[j:i + tamanho_segmento] = np.roll(meio[j:i + tamanho_segmento], tamanho_segmento)
+
+
+CROSSOVERS = ("ox", "pmx", "erx")
+MUTACOES = ("troca", "inversao", "or_opt")
+
+
+def cruzar(pai1, pai2, tipo, rng, tamanho_ids):
+    if tipo == "erx":
+        return crossover_erx(pai1, pai2, rng)
+    inicio, fim = sortear_cortes(rng, len(pai1))
+    if tipo == "pmx":
+        return crossover_pmx(pai1, pai2, inicio, fim, tamanho_ids)
+    return crossover_ox(pai1, pai2, inicio, fim, tamanho_ids)
+
+
+def mutar(meio, tipo, taxa, rng):
+    if tipo == "troca":
+        mutacao_troca(meio, taxa, rng)
+    elif rng.random() < 1 - (1 - taxa) ** len(meio):
+        # Mesma chance de alterar o indivíduo que a troca gene a gene
+        if tipo == "inversao":
+            mutacao_inversao(meio, rng)
+        else:
+            mutacao_or_opt(meio, rng)
+
+
+def crossover_ox_lote(pais1, pais2, rng, tamanho_ids):
+    quantidade, tamanho = pais1.shape
+    inicio, fim = sortear_cortes(rng, tamanho, quantidade)
+
+    posicoes = np.arange(tamanho)
+    no_segmento = (posicoes >= inicio[:, None]) & (posicoes < fim[:, None])
+    linhas = np.arange(quantidade)[:, None]
+
+    marcadas = np.zeros((quantidade, tamanho_ids), dtype=bool)
+    marcadas[np.nonzero(no_segmento)[0], pais1[no_segmento]] = True
+    manter = ~marcadas[linhas, pais2]
+
+    # Cada linha mantém de pai2 exatamente tantas cidades quantas posições ficam fora do segmento
+    filhos = np.empty_like(pais1)
+    filhos[no_segmento] = pais1[no_segmento]
+    filhos[~no_segmento] = pais2[manter]
+    return filhos
+
+
+def cruzar_lote(pais1, pais2, tipo, rng, tamanho_ids):
+    if tipo == "ox":
+        return crossover_ox_lote(pais1, pais2, rng, tamanho_ids)
+    return np.array([
+        cruzar(pai1, pai2, tipo, rng, tamanho_ids) for pai1, pai2 in zip(pais1, pais2)
+    ], dtype=np.intp).reshape(pais1.shape)
+
+
+def mutar_lote(meios, tipo, taxa, rng):
+    quantidade, tamanho = meios.shape
+    if tipo == "troca":
+        linhas, colunas = np.nonzero(rng.random((quantidade, tamanho)) < taxa)
+        trocas = rng.integers(tamanho, size=len(linhas))
+        for linha, i, j in zip(linhas, colunas, trocas):
+            meios[linha, i], meios[linha, j] = meios[linha, j], meios[linha, i]
+        return
+
+    selecionadas = np.flatnonzero(rng.random(quantidade) < 1 - (1 - taxa) ** tamanho)
+    if tipo == "inversao":
+        cortes = np.sort(rng.integers(tamanho, size=(len(selecionadas), 2)), axis=1)
+        i, j = cortes[:, :1], cortes[:, 1:]
+        posicoes = np.arange(tamanho)
+        origem = np.where((posicoes >= i) & (posicoes <= j), i + j - posicoes, posicoes)
+        meios[selecionadas] = np.take_along_axis(meios[selecionadas], origem, axis=1)
+    else:
+        for linha in selecionadas:
+            mutacao_or_opt(meios[linha], rng)
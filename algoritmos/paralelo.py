@@ -0,0 +1,134 @@
+import multiprocessing as mp
+import time
+
+import numpy as np
+
+from utils.matriz_distancias import MatrizDistancias, MatrizCompartilhada
+from utils.convergencia import TracoConvergencia, notificar
+from utils.criterio_parada import CriterioParada
+from utils.top_rotas import TopRotas
+
+
+class CoordenadorMigracao:
+    # Subclasses definem rotulo (nome para os observadores) e nome_processo (nome de cada trabalhador nas mensagens).
+    # O trabalhador recebe ("iterar", passo, migrante) e responde (emigrante, melhor_distancia);
+    # recebe ("finalizar",) e responde com o seu TopRotas.
+    rotulo = None
+    nome_processo = "processo"
+
+    def __init__(self, grafo, num_processos, intervalo_migracao, num_iteracoes, semente, parametros):
+        self.matriz = MatrizDistancias.de_grafo(grafo)
+        self.num_processos = num_processos
+        self.intervalo_migracao = intervalo_migracao
+        self.num_iteracoes = num_iteracoes
+        self.semente = np.random.SeedSequence().entropy if semente is None else semente
+        # Observadores e cancelamento ficam no processo principal: não são enviados aos processos filhos
+        self.observadores = list(parametros.pop("observadores", None) or [])
+        cancelamento = parametros.pop("cancelamento", None)
+        self.parametros = parametros
+        self.criterio_parada = CriterioParada(
+            num_iteracoes,
+            parametros.get("max_estagnacao"),
+            parametros.get("custo_alvo"),
+            parametros.get("tempo_limite"),
+            parametros.get("limite_inferior"),
+            cancelamento,
+        )
+
+    def falha(self, i, processo):
+        processo.join(1)
+        return RuntimeError(
+            f"{self.rotulo}: {self.nome_processo} {i + 1} terminou inesperadamente (código de saída {processo.exitcode})"
+        )
+
+    def receber(self, conexoes, processos):
+        respostas = []
+        for i, (conexao, processo) in enumerate(zip(conexoes, processos)):
+            try:
+                respostas.append(conexao.recv())
+            except (EOFError, ConnectionResetError):
+                raise self.falha(i, processo) from None
+        return respostas
+
+    def enviar(self, conexoes, processos, mensagens):
+        for i, (conexao, processo, mensagem) in enumerate(zip(conexoes, processos, mensagens)):
+            try:
+                conexao.send(mensagem)
+            except (BrokenPipeError, ConnectionResetError):
+                raise self.falha(i, processo) from None
+
+    def coordenar(self, trabalhador, argumentos, migrar, migrantes):
+        inicio = time.time()
+        inicio_ns = time.perf_counter_ns()
+        self.criterio_parada.iniciar()
+        traco = TracoConvergencia(self.num_iteracoes)
+
+        # Cada processo recebe uma SeedSequence filha: fluxos independentes e reproduzíveis
+        sementes = np.random.SeedSequence(self.semente).spawn(self.num_processos)
+
+        with MatrizCompartilhada(self.matriz) as compartilhada:
+            conexoes = []
+            processos = []
+            try:
+                for semente in sementes:
+                    local, remota = mp.Pipe()
+                    processo = mp.Process(
+                        target=trabalhador,
+                        args=(compartilhada.descritor, semente, remota, *argumentos),
+                        daemon=True,
+                    )
+                    processo.start()
+                    # Sem a ponta remota aberta aqui, a morte do filho chega como EOFError em vez de travar o recv
+                    remota.close()
+                    conexoes.append(local)
+                    processos.append(processo)
+
+                feitas = 0
+                while True:
+                    passo = self.intervalo_migracao
+                    if self.num_iteracoes is not None:
+                        passo = min(passo, self.num_iteracoes - feitas)
+                    self.enviar(conexoes, processos, [("iterar", passo, migrante) for migrante in migrantes])
+                    respostas = self.receber(conexoes, processos)
+                    feitas += passo
+
+                    migrantes = migrar([emigrante for emigrante, _ in respostas])
+
+                    distancias = [distancia for _, distancia in respostas]
+                    melhor_distancia = min(distancias)
+                    traco.registrar(feitas, melhor_distancia, melhor_distancia, np.mean(distancias),
+                                    time.perf_counter_ns() - inicio_ns)
+                    if self.observadores:
+                        notificar(self.observadores, self.rotulo, traco)
+
+                    if self.criterio_parada.verificar(feitas, melhor_distancia):
+                        break
+
+                self.enviar(conexoes, processos, [("finalizar",)] * self.num_processos)
+                tops = self.receber(conexoes, processos)
+                for processo in processos:
+                    processo.join()
+            finally:
+                # Em caso de erro, os demais processos não podem continuar presos à memória compartilhada
+                for processo in processos:
+                    if processo.is_alive():
+                        processo.terminate()
+                        processo.join()
+
+        tempo_execucao = time.time() - inicio
+
+        top_rotas = TopRotas(self.parametros.get("num_top_rotas", 3))
+        for top in tops:
+            top_rotas.juntar(top)
+        top3 = top_rotas.melhores()
+
+        return {
+            "melhor_rota": self.matriz.nomes(top3[0][0]),
+            "distancia": top3[0][1],
+            "tempo": tempo_execucao,
+            "top3_rotas": [self.matriz.nomes(rota) for rota, _ in top3],
+            "iteracoes": feitas,
+            "semente": self.semente,
+            "convergencia": traco.para_dict(),
+            **self.criterio_parada.resumo()
+        }
@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+from algoritmos.aco import ACO
+from algoritmos.aco_paralelo import ACOMultiColonia
+from algoritmos.genetico import AlgoritmoGenetico
+from algoritmos.genetico_paralelo import AlgoritmoGeneticoIlhas
+from algoritmos.exato import resolver_exato
+
+ITERACOES_PADRAO = 500
+SOLVERS_PADRAO = ("aco", "genetico")
+
+
+@dataclass
+class Orcamento:
+    # Só com tempo_limite, o solver roda até o tempo acabar (ou até estagnar)
+    iteracoes: int = None
+    tempo_limite: float = None
+
+
+@dataclass
+class Resultado:
+    algoritmo: str
+    melhor_rota: list
+    distancia: float
+    tempo: float
+    iteracoes: int
+    convergencia: dict = None
+    top3_rotas: list = field(default_factory=list)
+    motivo_parada: str = None
+    iteracao_melhoria: int = None
+    semente: int = None
+    tempo_processo: float = None
+
+
+class Solver(ABC):
+    # Subclasses definem nome (chave no registro), rotulo (nome nos relatórios) e executar(orcamento)
+    nome = None
+    rotulo = None
+    unidade = "Iteração"
+    descricao = ""
+    # Solvers que abrem os próprios processos não podem rodar dentro de processos daemon (mp.Pool)
+    usa_processos = False
+    parametros_padrao = {}
+
+    def __init__(self, matriz, origem="Patrocínio", semente=None, limite_inferior=None, observadores=None,
+                 cancelamento=None, **parametros):
+        self.matriz = matriz
+        self.origem = origem
+        self.semente = semente
+        self.limite_inferior = limite_inferior
+        self.observadores = list(observadores or [])
+        self.cancelamento = cancelamento
+        self.parametros = dict(self.parametros_padrao, **parametros)
+
+    def iteracoes(self, orcamento):
+        if orcamento.iteracoes is not None:
+            return orcamento.iteracoes
+        return None if orcamento.tempo_limite is not None else ITERACOES_PADRAO
+
+    @abstractmethod
+    def executar(self, orcamento):
+        pass
+
+    def resolver(self, orcamento=None):
+        dados = self.executar(orcamento or Orcamento())
+        return Resultado(
+            algoritmo=self.rotulo,
+            melhor_rota=dados["melhor_rota"],
+            distancia=float(dados["distancia"]),
+            tempo=dados["tempo"],
+            iteracoes=dados.get("iteracoes", 0),
+            convergencia=dados.get("convergencia"),
+            top3_rotas=dados.get("top3_rotas", [dados["melhor_rota"]]),
+            motivo_parada=dados.get("motivo_parada"),
+            iteracao_melhoria=dados.get("iteracao_melhoria"),
+            semente=dados.get("semente", self.semente),
+        )
+
+
+SOLVERS = {}
+
+
+def registrar_solver(classe):
+    SOLVERS[classe.nome] = classe
+    return classe
+
+
+def listar_solvers():
+    return [(nome, classe.rotulo, classe.descricao) for nome, classe in SOLVERS.items()]
+
+
+def criar_solver(nome, matriz, **opcoes):
+    if nome not in SOLVERS:
+        raise ValueError(f"Solver desconhecido: {nome} (disponíveis: {', '.join(SOLVERS)})")
+    return SOLVERS[nome](matriz, **opcoes)
+
+
+@registrar_solver
+class SolverACO(Solver):
+    nome = "aco"
+    rotulo = "ACO"
+    descricao = "Colônia de formigas (Ant System) com 2-opt/Or-opt"
+    classe = ACO
+    parametros_padrao = {"num_formigas": 50, "busca_local": True, "max_estagnacao": 100}
+
+    def executar(self, orcamento):
+        aco = self.classe(self.matriz, num_iteracoes=self.iteracoes(orcamento), tempo_limite=orcamento.tempo_limite,
+                          limite_inferior=self.limite_inferior, observadores=self.observadores,
+                          semente=self.semente, cancelamento=self.cancelamento, **self.parametros)
+        return aco.executar(self.origem)
+
+
+@registrar_solver
+class SolverMMAS(SolverACO):
+    nome = "aco_mmas"
+    rotulo = "ACO (MMAS)"
+    descricao = "MAX-MIN Ant System com listas de candidatos"
+    parametros_padrao = dict(SolverACO.parametros_padrao, variante="MMAS", num_candidatos=15)
+
+
+@registrar_solver
+class SolverACOColonias(SolverACO):
+    nome = "aco_colonias"
+    rotulo = "ACO (colônias)"
+    descricao = "Colônias de formigas em processos paralelos, com migração em anel"
+    classe = ACOMultiColonia
+    usa_processos = True
+    parametros_padrao = dict(SolverACO.parametros_padrao, num_colonias=4, intervalo_migracao=10)
+
+
+@registrar_solver
+class SolverGenetico(Solver):
+    nome = "genetico"
+    rotulo = "Genético"
+    unidade = "Geração"
+    descricao = "Algoritmo genético com crossover OX e busca local"
+    classe = AlgoritmoGenetico
+    parametros_padrao = {"tamanho_populacao": 300, "taxa_mutacao": 0.02, "busca_local": True, "max_estagnacao": 100}
+
+    def executar(self, orcamento):
+        ga = self.classe(self.matriz, num_geracoes=self.iteracoes(orcamento), origem=self.origem,
+                         tempo_limite=orcamento.tempo_limite, limite_inferior=self.limite_inferior,
+                         observadores=self.observadores, semente=self.semente,
+                         cancelamento=self.cancelamento, **self.parametros)
+        return ga.executar()
+
+
+@registrar_solver
+class SolverGeneticoIlhas(SolverGenetico):
+    nome = "genetico_ilhas"
+    rotulo = "Genético (ilhas)"
+    descricao = "Ilhas do algoritmo genético em processos paralelos, com migração em anel"
+    classe = AlgoritmoGeneticoIlhas
+    usa_processos = True
+    parametros_padrao = dict(SolverGenetico.parametros_padrao, num_ilhas=4, intervalo_migracao=10)
+
+
+@registrar_solver
+class SolverExato(Solver):
+    nome = "exato"
+    rotulo = "Exato"
+    descricao = "Held–Karp até 15 cidades, branch-and-bound acima (limitado pelo tempo_limite)"
+    # Sem tempo_limite no orçamento, o branch-and-bound podia rodar por horas
+    tempo_limite_padrao = 30.0
+
+    def executar(self, orcamento):
+        tempo_limite = self.tempo_limite_padrao if orcamento.tempo_limite is None else orcamento.tempo_limite
+        resultado = resolver_exato(self.matriz, self.origem, tempo_limite=tempo_limite,
+                                   cancelamento=self.cancelamento, **self.parametros)
+        return dict(resultado, iteracoes=1)
@@ -0,0 +1,155 @@
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows não tem getrusage: o benchmark roda sem a coluna de memória
+    resource = None
+
+from algoritmos.registro import SOLVERS, Orcamento, criar_solver
+from algoritmos.exato import resolver_exato, limite_inferior, calcular_gap
+from utils.grafo_completo import calcular_fechamento
+from utils.instancias import gerar_grafo_geometrico, carregar_tsplib, OTIMOS_TSPLIB
+
+COLUNAS = [
+    "instancia", "num_cidades", "solver", "semente", "tempo_s", "memoria_pico_mb",
+    "custo", "referencia", "tipo_referencia", "gap_percent", "iteracoes", "motivo_parada"
+]
+
+
+def montar_instancias(tamanhos, grau_medio, semente_instancia, arquivos_tsplib):
+    for tamanho in tamanhos:
+        grafo, _ = gerar_grafo_geometrico(tamanho, grau_medio, semente=semente_instancia)
+        matriz = calcular_fechamento(grafo, com_predecessores=False).matriz_distancias()
+        yield f"geo{tamanho}_g{grau_medio}_s{semente_instancia}", matriz
+
+    for caminho in arquivos_tsplib:
+        yield carregar_tsplib(caminho)
+
+
+def calcular_referencia(nome, matriz, origem, limite_exato):
+    if nome in OTIMOS_TSPLIB:
+        return float(OTIMOS_TSPLIB[nome]), "otimo_conhecido"
+    if len(matriz) <= limite_exato:
+        return resolver_exato(matriz, origem)["distancia"], "otimo"
+    return limite_inferior(matriz, especial=matriz.indice[origem])[0], "limite_inferior"
+
+
+def pico_rss_mb():
+    # ru_maxrss vem em KB no Linux; os filhos entram pelo maior deles (colônias e ilhas rodam em processos)
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(proprio, filhos) / 1024
+
+
+def medir_memoria(solver, matriz, origem, semente, orcamento, fila):
+    # Num processo novo o pico de RSS não carrega o das execuções anteriores; descontamos o que veio do fork
+    inicial = pico_rss_mb()
+    criar_solver(solver, matriz, origem=origem, semente=semente).resolver(orcamento)
+    fila.put(pico_rss_mb() - inicial)
+
+
+def medir(solver, matriz, origem, semente, orcamento, com_memoria):
+    inicio = time.perf_counter()
+    resultado = criar_solver(solver, matriz, origem=origem, semente=semente).resolver(orcamento)
+    tempo = time.perf_counter() - inicio
+
+    # A memória sai de uma segunda execução, para não pesar no tempo medido acima
+    memoria_pico = None
+    if com_memoria and resource is not None:
+        fila = mp.Queue()
+        processo = mp.Process(target=medir_memoria, args=(solver, matriz, origem, semente, orcamento, fila))
+        processo.start()
+        memoria_pico = fila.get()
+        processo.join()
+    return resultado, tempo, memoria_pico
+
+
+def executar_benchmark(tamanhos, sementes, solvers, grau_medio=3, semente_instancia=0, arquivos_tsplib=(),
+                       iteracoes=200, tempo_limite=None, limite_exato=15, com_memoria=True):
+    # Todos os solvers recebem o mesmo orçamento de iterações e/ou tempo
+    orcamento = Orcamento(iteracoes, tempo_limite)
+    for nome, matriz in montar_instancias(tamanhos, grau_medio, semente_instancia, arquivos_tsplib):
+        origem = matriz.cidades[0]
+        referencia, tipo_referencia = calcular_referencia(nome, matriz, origem, limite_exato)
+        print(f"\n>>> {nome} ({len(matriz)} cidades) — referência {referencia:.1f} ({tipo_referencia})")
+
+        for solver in solvers:
+            if solver == "exato" and len(matriz) > limite_exato:
+                # Branch-and-bound cresce exponencialmente: acima do limite não cabe num benchmark
+                print(f"{solver:>9}: ignorado acima de {limite_exato} cidades")
+                continue
+            for semente in sementes:
+                resultado, tempo, memoria_pico = medir(
+                    solver, matriz, origem, semente, orcamento, com_memoria
+                )
+                linha = {
+                    "instancia": nome,
+                    "num_cidades": len(matriz),
+                    "solver": solver,
+                    "semente": semente,
+                    "tempo_s": round(tempo, 4),
+                    "memoria_pico_mb": None if memoria_pico is None else round(memoria_pico, 2),
+                    "custo": resultado.distancia,
+                    "referencia": float(referencia),
+                    "tipo_referencia": tipo_referencia,
+                    "gap_percent": round(calcular_gap(resultado.distancia, referencia), 3),
+                    "iteracoes": resultado.iteracoes,
+                    "motivo_parada": resultado.motivo_parada,
+                }
+                print(f"{solver:>9} semente={semente}: custo={linha['custo']:.1f} "
+                      f"gap={linha['gap_percent']:.2f}% tempo={linha['tempo_s']:.3f}s")
+                yield linha
+
+
+def salvar_resultados(linhas, prefixo):
+    with open(f"{prefixo}.csv", "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS)
+        escritor.writeheader()
+        escritor.writerows(linhas)
+
+    with open(f"{prefixo}.json", "w", encoding="utf-8") as arquivo:
+        json.dump(linhas, arquivo, ensure_ascii=False, indent=2)
+
+    print(f"\n📄 Resultados salvos em {prefixo}.csv e {prefixo}.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de roteamento")
+    parser.add_argument("--tamanhos", type=int, nargs="*", default=[25, 50, 100],
+                        help="números de cidades das instâncias sintéticas")
+    parser.add_argument("--sementes", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--solvers", nargs="+", default=["aco", "genetico"], choices=list(SOLVERS))
+    parser.add_argument("--grau-medio", type=int, default=3, help="grau médio da malha rodoviária sintética")
+    parser.add_argument("--semente-instancia", type=int, default=0)
+    parser.add_argument("--tsplib", nargs="*", default=[], help="arquivos .tsp da TSPLIB")
+    parser.add_argument("--iteracoes", type=int, default=200)
+    parser.add_argument("--tempo-limite", type=float, default=None, help="orçamento em segundos por execução")
+    parser.add_argument("--limite-exato", type=int, default=15,
+                        help="até quantas cidades usar o solver exato (acima a referência é o limite inferior)")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede o pico de memória (cada execução é repetida num processo à parte)")
+    parser.add_argument("--saida", default="benchmark", help="prefixo dos arquivos CSV/JSON")
+    argumentos = parser.parse_args()
+
+    linhas = list(executar_benchmark(
+        argumentos.tamanhos,
+        argumentos.sementes,
+        argumentos.solvers,
+        grau_medio=argumentos.grau_medio,
+        semente_instancia=argumentos.semente_instancia,
+        arquivos_tsplib=argumentos.tsplib,
+        iteracoes=argumentos.iteracoes,
+        tempo_limite=argumentos.tempo_limite,
+        limite_exato=argumentos.limite_exato,
+        com_memoria=not argumentos.sem_memoria,
+    ))
+    salvar_resultados(linhas, argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,153 @@
+import matplotlib
+matplotlib.use("Agg")  # os gráficos são gerados fora da thread do Tk
+
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 import os
+import queue
+import threading
 import webbrowser
-from main import main
+from main import executar_cenario
+from algoritmos.registro import ITERACOES_PADRAO, SOLVERS_PADRAO, listar_solvers
+from utils.grafo_utils import carregar_grafo, tornar_grafo_bidirecional
+
+INTERVALO_ATUALIZACAO_MS = 100
+
+cidades = sorted(tornar_grafo_bidirecional(carregar_grafo('data/grafo.json')))
+solvers = listar_solvers()
+estradas_bloqueadas = []
+custos_extras = []
+# Solvers da última execução concluída, para abrir os mapas de cada um
+solvers_executados = list(SOLVERS_PADRAO)
+
+# A thread de execução só conversa com o Tk por esta fila
+fila_eventos = queue.Queue()
+cancelamento = threading.Event()
+execucao = None
 
 # Funções de interface
-def executar_algoritmos():
+def trabalhar(bloqueadas, extras, selecionados):
     try:
-        main()
-        messagebox.showinfo("Execução Concluída", "ACO e GA executados com sucesso!")
+        resultado = executar_cenario(
+            bloqueadas, extras, verboso=False,
+            observadores=[lambda progresso: fila_eventos.put(("progresso", progresso))],
+            cancelamento=cancelamento, solvers=selecionados
+        )
+        fila_eventos.put(("cancelado", None) if resultado is None else ("concluido", (selecionados, resultado)))
     except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao executar os algoritmos:\n{e}")
+        fila_eventos.put(("erro", e))
+
+def executar_algoritmos():
+    global execucao
+    if execucao is not None and execucao.is_alive():
+        return
+    selecionados = [solvers[i][0] for i in lista_solvers.curselection()]
+    if not selecionados:
+        messagebox.showerror("Erro", "Selecione ao menos um algoritmo.")
+        return
+
+    cancelamento.clear()
+    botao_executar.config(state=tk.DISABLED)
+    botao_cancelar.config(state=tk.NORMAL)
+    barra_progresso.config(value=0)
+    rotulo_progresso.config(text="Iniciando...")
+
+    execucao = threading.Thread(
+        target=trabalhar, args=(list(estradas_bloqueadas), list(custos_extras), selecionados), daemon=True
+    )
+    execucao.start()
+    root.after(INTERVALO_ATUALIZACAO_MS, verificar_fila)
+
+def cancelar_execucao():
+    cancelamento.set()
+    botao_cancelar.config(state=tk.DISABLED)
+    rotulo_progresso.config(text="Cancelando...")
+
+def finalizar_execucao():
+    botao_executar.config(state=tk.NORMAL)
+    botao_cancelar.config(state=tk.DISABLED)
+
+def verificar_fila():
+    # Só o último progresso de cada lote interessa para a tela
+    progresso = None
+    while True:
+        try:
+            tipo, dados = fila_eventos.get_nowait()
+        except queue.Empty:
+            break
+
+        if tipo == "progresso":
+            progresso = dados
+        elif tipo == "concluido":
+            selecionados, (resultados, referencia) = dados
+            solvers_executados[:] = selecionados
+            finalizar_execucao()
+            barra_progresso.config(value=barra_progresso["maximum"])
+            rotulo_progresso.config(
+                text=" | ".join(f"{resultado.algoritmo}: {resultado.distancia}" for resultado in resultados)
+                     + f" | Referência: {referencia}"
+            )
+            messagebox.showinfo("Execução Concluída", "Algoritmos executados com sucesso!")
+            return
+        elif tipo == "cancelado":
+            finalizar_execucao()
+            barra_progresso.config(value=0)
+            rotulo_progresso.config(text="Execução cancelada.")
+            return
+        elif tipo == "erro":
+            finalizar_execucao()
+            rotulo_progresso.config(text="Erro na execução.")
+            messagebox.showerror("Erro", f"Erro ao executar os algoritmos:\n{dados}")
+            return
+
+    if progresso is not None:
+        barra_progresso.config(value=progresso["iteracao"])
+        rotulo_progresso.config(
+            text=f"{progresso['algoritmo']} — iteração {progresso['iteracao']}: "
+                 f"melhor {progresso['melhor']:.1f} (média {progresso['media']:.1f}, "
+                 f"{progresso['decorrido_ns'] / 1e9:.1f}s)"
+        )
+    root.after(INTERVALO_ATUALIZACAO_MS, verificar_fila)
+
+def ler_estrada_selecionada():
+    cidade1, cidade2 = combo_cidade1.get(), combo_cidade2.get()
+    if cidade1 not in cidades or cidade2 not in cidades or cidade1 == cidade2:
+        messagebox.showerror("Erro", "Escolha duas cidades diferentes.")
+        return None
+    return cidade1, cidade2
+
+def bloquear_estrada():
+    estrada = ler_estrada_selecionada()
+    if estrada is None:
+        return
+    estradas_bloqueadas.append(estrada)
+    lista_cenario.insert(tk.END, f"🚧 {estrada[0]} ↔ {estrada[1]}")
+
+def adicionar_custo():
+    estrada = ler_estrada_selecionada()
+    if estrada is None:
+        return
+    try:
+        custo = float(entrada_custo.get().replace(",", "."))
+    except ValueError:
+        messagebox.showerror("Erro", "Informe um custo numérico.")
+        return
+    custos_extras.append((*estrada, custo))
+    lista_cenario.insert(tk.END, f"💲 {estrada[0]} ↔ {estrada[1]}: +{custo}")
+
+def remover_selecionado():
+    for indice in reversed(lista_cenario.curselection()):
+        if indice < len(estradas_bloqueadas):
+            estradas_bloqueadas.pop(indice)
+        else:
+            custos_extras.pop(indice - len(estradas_bloqueadas))
+
+    # Bloqueios ficam antes dos custos na lista, na mesma ordem das listas do cenário
+    lista_cenario.delete(0, tk.END)
+    for cidade1, cidade2 in estradas_bloqueadas:
+        lista_cenario.insert(tk.END, f"🚧 {cidade1} ↔ {cidade2}")
+    for cidade1, cidade2, custo in custos_extras:
+        lista_cenario.insert(tk.END, f"💲 {cidade1} ↔ {cidade2}: +{custo}")
 
 def abrir_mapa(nome_arquivo):
     caminho = os.path.abspath(nome_arquivo)
@@ -19,6 +156,10 @@ def abrir_mapa(nome_arquivo):
     else:
         messagebox.showerror("Erro", f"O arquivo {nome_arquivo} não foi encontrado.")
 
+def abrir_mapas_top3():
+    for nome in solvers_executados:
+        abrir_mapa(f"mapa_{nome}_top3.html")
+
 def abrir_tabela_html():
     caminho = os.path.abspath("tabela_comparativa_render.html")
     if os.path.exists(caminho):
@@ -29,21 +170,57 @@ def abrir_tabela_html():
 # GUI
 root = tk.Tk()
 root.title("Otimizador Logístico - ACO e GA")
-root.geometry("400x500")
+root.geometry("460x900")
 
 fonte = ("Segoe UI", 11)
 
 tk.Label(root, text="Otimizador Logístico - ACO e GA", font=("Segoe UI", 14, "bold")).pack(pady=20)
 
-tk.Button(root, text="▶️ Executar ACO e GA", font=fonte, command=executar_algoritmos, width=30).pack(pady=10)
+tk.Label(root, text="Cenário:", font=("Segoe UI", 12, "underline")).pack(pady=5)
 
-tk.Label(root, text="Abrir Mapas:", font=("Segoe UI", 12, "underline")).pack(pady=5)
+quadro_cidades = tk.Frame(root)
+quadro_cidades.pack(pady=4)
+combo_cidade1 = ttk.Combobox(quadro_cidades, values=cidades, state="readonly", width=18)
+combo_cidade1.pack(side=tk.LEFT, padx=4)
+tk.Label(quadro_cidades, text="↔", font=fonte).pack(side=tk.LEFT)
+combo_cidade2 = ttk.Combobox(quadro_cidades, values=cidades, state="readonly", width=18)
+combo_cidade2.pack(side=tk.LEFT, padx=4)
+
+quadro_acoes = tk.Frame(root)
+quadro_acoes.pack(pady=4)
+tk.Button(quadro_acoes, text="🚧 Bloquear", font=fonte, command=bloquear_estrada).pack(side=tk.LEFT, padx=4)
+tk.Label(quadro_acoes, text="Custo:", font=fonte).pack(side=tk.LEFT)
+entrada_custo = tk.Entry(quadro_acoes, width=8, font=fonte)
+entrada_custo.pack(side=tk.LEFT, padx=4)
+tk.Button(quadro_acoes, text="💲 Adicionar", font=fonte, command=adicionar_custo).pack(side=tk.LEFT, padx=4)
+
+lista_cenario = tk.Listbox(root, height=6, width=50, selectmode=tk.EXTENDED)
+lista_cenario.pack(pady=4)
+tk.Button(root, text="Remover selecionados", font=fonte, command=remover_selecionado).pack(pady=4)
+
+tk.Label(root, text="Algoritmos:", font=("Segoe UI", 12, "underline")).pack(pady=5)
+lista_solvers = tk.Listbox(root, height=len(solvers), width=50, selectmode=tk.MULTIPLE, exportselection=False)
+for i, (nome, rotulo, descricao) in enumerate(solvers):
+    lista_solvers.insert(tk.END, f"{rotulo} — {descricao}")
+    if nome in SOLVERS_PADRAO:
+        lista_solvers.selection_set(i)
+lista_solvers.pack(pady=4)
 
-tk.Button(root, text="📍 Ver Rotas ACO (top 3)", font=fonte,
-          command=lambda: abrir_mapa("mapa_aco_top3.html")).pack(pady=4)
+botao_executar = tk.Button(root, text="▶️ Executar algoritmos", font=fonte, command=executar_algoritmos, width=30)
+botao_executar.pack(pady=10)
+botao_cancelar = tk.Button(root, text="⏹️ Cancelar", font=fonte, command=cancelar_execucao, width=30,
+                           state=tk.DISABLED)
+botao_cancelar.pack(pady=4)
+
+barra_progresso = ttk.Progressbar(root, length=380, maximum=ITERACOES_PADRAO)
+barra_progresso.pack(pady=6)
+rotulo_progresso = tk.Label(root, text="Aguardando execução.", font=("Segoe UI", 9), wraplength=420)
+rotulo_progresso.pack(pady=4)
+
+tk.Label(root, text="Abrir Mapas:", font=("Segoe UI", 12, "underline")).pack(pady=5)
 
-tk.Button(root, text="📍 Ver Rotas GA (top 3)", font=fonte,
-          command=lambda: abrir_mapa("mapa_genetico_top3.html")).pack(pady=4)
+tk.Button(root, text="📍 Ver Rotas de cada algoritmo (top 3)", font=fonte,
+          command=abrir_mapas_top3).pack(pady=4)
 
 tk.Button(root, text="🧭 Ver Mapa Comparativo", font=fonte,
           command=lambda: abrir_mapa("mapa_comparativo.html")).pack(pady=4)
@@ -0,0 +1,227 @@
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import os
+import time
+
+from main import calcular_referencia, resolver_cenario
+from algoritmos.registro import SOLVERS, SOLVERS_PADRAO, Orcamento
+from algoritmos.exato import calcular_gap
+from utils.cache_grafo import CacheGrafos
+from utils.matriz_distancias import SEM_CAMINHO
+
+CAMPOS_INICIO = ["id", "estradas_bloqueadas", "custos_extras", "viavel", "referencia"]
+CAMPOS_FIM = ["melhor_algoritmo", "melhor_distancia", "gap_percent", "melhor_rota", "tempo_s", "semente", "erro"]
+
+# Fechamento do grafo base, carregado uma vez por processo trabalhador
+fechamento_base = None
+
+
+def converter_estrada(campos, com_custo=False):
+    # Bloqueio: (cidade1, cidade2); custo extra: (cidade1, cidade2, custo)
+    cidade1, cidade2, *resto = campos
+    if not isinstance(cidade1, str) or not isinstance(cidade2, str):
+        raise TypeError(f"Nomes de cidade devem ser texto: {campos}")
+    if com_custo:
+        (custo,) = resto
+        return cidade1, cidade2, float(custo)
+    if resto:
+        raise ValueError(f"Bloqueio com campos a mais: {campos}")
+    return cidade1, cidade2
+
+
+def ler_estradas(texto, com_custo=False):
+    # CSV: estradas separadas por ";" e campos por "|" (nomes como Guarda-Mor têm hífen)
+    estradas = []
+    for item in (texto or "").split(";"):
+        if not item.strip():
+            continue
+        estradas.append(converter_estrada([campo.strip() for campo in item.split("|")], com_custo))
+    return estradas
+
+
+def cenario_invalido(id_cenario, erro):
+    return {"id": id_cenario, "estradas_bloqueadas": [], "custos_extras": [], "semente": None,
+            "erro": f"Linha inválida: {type(erro).__name__}: {erro}"}
+
+
+def ler_cenarios(caminho_arquivo):
+    # Uma linha malformada vira uma linha de erro no resultado; o resto do lote segue
+    with open(caminho_arquivo, "r", encoding="utf-8", newline="") as arquivo:
+        if caminho_arquivo.endswith(".csv"):
+            for i, linha in enumerate(csv.DictReader(arquivo)):
+                id_cenario = linha.get("id") or str(i + 1)
+                try:
+                    cenario = {
+                        "id": id_cenario,
+                        "estradas_bloqueadas": ler_estradas(linha.get("estradas_bloqueadas")),
+                        "custos_extras": ler_estradas(linha.get("custos_extras"), com_custo=True),
+                        "semente": int(linha["semente"]) if linha.get("semente") else None,
+                    }
+                except (ValueError, TypeError) as erro:
+                    cenario = cenario_invalido(id_cenario, erro)
+                yield cenario
+            return
+
+        for i, linha in enumerate(arquivo):
+            if not linha.strip():
+                continue
+            id_cenario = str(i + 1)
+            try:
+                dados = json.loads(linha)
+                id_cenario = str(dados.get("id", id_cenario))
+                semente = dados.get("semente")
+                cenario = {
+                    "id": id_cenario,
+                    "estradas_bloqueadas": [converter_estrada(estrada) for estrada in dados.get("estradas_bloqueadas", [])],
+                    "custos_extras": [converter_estrada(estrada, com_custo=True)
+                                      for estrada in dados.get("custos_extras", [])],
+                    "semente": None if semente is None else int(semente),
+                }
+            except (ValueError, TypeError, AttributeError) as erro:
+                cenario = cenario_invalido(id_cenario, erro)
+            yield cenario
+
+
+def campos_saida(solvers):
+    # Uma coluna custo_<solver> para cada solver comparado
+    return CAMPOS_INICIO + [f"custo_{nome}" for nome in solvers] + CAMPOS_FIM
+
+
+def iniciar_trabalhador(fechamento):
+    global fechamento_base
+    fechamento_base = fechamento
+
+
+def resolver_linha(tarefa):
+    indice, cenario, semente_lote, origem, solvers, orcamento = tarefa
+    linha = {
+        "id": cenario["id"],
+        "estradas_bloqueadas": ";".join("|".join(estrada) for estrada in cenario["estradas_bloqueadas"]),
+        "custos_extras": ";".join(f"{c1}|{c2}|{custo}" for c1, c2, custo in cenario["custos_extras"]),
+    }
+    if cenario.get("erro"):
+        linha.update(erro=cenario["erro"], tempo_s=0.0)
+        return linha
+
+    semente = cenario["semente"]
+    if semente is None and semente_lote is not None:
+        semente = semente_lote + indice
+
+    inicio = time.perf_counter()
+    # Sem isto, estradas com cidades desconhecidas seriam ignoradas e o cenário sairia como viável
+    desconhecidas = sorted({
+        cidade
+        for estrada in cenario["estradas_bloqueadas"] + [custo[:2] for custo in cenario["custos_extras"]]
+        for cidade in estrada if cidade not in fechamento_base.indice
+    })
+    if desconhecidas:
+        linha.update(erro=f"Cidades desconhecidas: {', '.join(desconhecidas)}", tempo_s=0.0)
+        return linha
+
+    try:
+        # Só as linhas afetadas pelo cenário são recalculadas a partir do fechamento base
+        matriz = fechamento_base.atualizar(cenario["estradas_bloqueadas"], cenario["custos_extras"]).matriz_distancias()
+        referencia, _ = calcular_referencia(matriz, origem)
+        # O paralelismo do lote é entre cenários; dentro do trabalhador os algoritmos rodam em sequência
+        resultados = resolver_cenario(matriz, referencia, semente=semente, paralelo=False, solvers=solvers,
+                                      orcamento=orcamento, origem=origem)
+    except Exception as erro:
+        linha.update(erro=f"{type(erro).__name__}: {erro}", tempo_s=round(time.perf_counter() - inicio, 4))
+        return linha
+
+    melhor = min(resultados, key=lambda resultado: resultado.distancia)
+    linha.update(viavel=melhor.distancia < SEM_CAMINHO, referencia=referencia)
+    linha.update({f"custo_{nome}": resultado.distancia for nome, resultado in zip(solvers, resultados)})
+    linha.update(
+        melhor_algoritmo=melhor.algoritmo,
+        melhor_distancia=melhor.distancia,
+        gap_percent=round(calcular_gap(melhor.distancia, referencia), 3),
+        melhor_rota=" → ".join(melhor.melhor_rota),
+        tempo_s=round(time.perf_counter() - inicio, 4),
+        semente=melhor.semente,
+    )
+    return linha
+
+
+class SaidaLote:
+    def __init__(self, caminho_arquivo, campos):
+        self.arquivo = open(caminho_arquivo, "w", encoding="utf-8", newline="")
+        self.escritor = None
+        if caminho_arquivo.endswith(".csv"):
+            self.escritor = csv.DictWriter(self.arquivo, fieldnames=campos)
+            self.escritor.writeheader()
+
+    def escrever(self, linha):
+        if self.escritor is not None:
+            self.escritor.writerow(linha)
+        else:
+            self.arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        # Cada cenário vai para o disco assim que termina
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def executar_lote(caminho_cenarios, caminho_saida, caminho_grafo="data/grafo.json", processos=None,
+                  semente=None, diretorio_cache=".cache_grafos", solvers=SOLVERS_PADRAO, orcamento=None,
+                  origem="Patrocínio"):
+    inicio = time.perf_counter()
+    fechamento = CacheGrafos(diretorio_cache).carregar_fechamento(caminho_grafo)
+    if origem not in fechamento.indice:
+        raise ValueError(f"Cidade de origem desconhecida: {origem}")
+    tarefas = (
+        (indice, cenario, semente, origem, solvers, orcamento)
+        for indice, cenario in enumerate(ler_cenarios(caminho_cenarios))
+    )
+    processos = processos or os.cpu_count() or 1
+    if processos > 1 and any(SOLVERS[nome].usa_processos for nome in solvers):
+        # Os trabalhadores do Pool são daemon: com solvers paralelos, o paralelismo fica dentro do solver
+        processos = 1
+
+    total = 0
+    with SaidaLote(caminho_saida, campos_saida(solvers)) as saida:
+        if processos == 1:
+            iniciar_trabalhador(fechamento)
+            for linha in map(resolver_linha, tarefas):
+                saida.escrever(linha)
+                total += 1
+        else:
+            with mp.Pool(processos, initializer=iniciar_trabalhador, initargs=(fechamento,)) as pool:
+                for linha in pool.imap_unordered(resolver_linha, tarefas, chunksize=4):
+                    saida.escrever(linha)
+                    total += 1
+
+    tempo_total = time.perf_counter() - inicio
+    print(f"✅ {total} cenários resolvidos em {tempo_total:.2f}s — resultados em {caminho_saida}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve um lote de cenários de bloqueios e custos extras")
+    parser.add_argument("cenarios", help="arquivo JSONL ou CSV com um cenário por linha")
+    parser.add_argument("saida", help="arquivo de resultados (.jsonl ou .csv)")
+    parser.add_argument("--grafo", default="data/grafo.json")
+    parser.add_argument("--origem", default="Patrocínio", help="cidade de partida e chegada das rotas")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: número de CPUs")
+    parser.add_argument("--semente", type=int, default=None, help="semente base; o cenário i usa semente + i")
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS_PADRAO), choices=list(SOLVERS))
+    parser.add_argument("--iteracoes", type=int, default=None)
+    parser.add_argument("--tempo-limite", type=float, default=None, help="orçamento em segundos por solver")
+    argumentos = parser.parse_args()
+
+    executar_lote(argumentos.cenarios, argumentos.saida, argumentos.grafo, argumentos.processos,
+                  argumentos.semente, solvers=argumentos.solvers,
+                  orcamento=Orcamento(argumentos.iteracoes, argumentos.tempo_limite), origem=argumentos.origem)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+import argparse
+import os
+
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from utils.grafo_utils import (
     carregar_grafo,
@@ -6,9 +10,12 @@ from utils.grafo_utils import (
     aplicar_restricoes,
     aplicar_custos_extras,
 )
-from utils.grafo_completo import gerar_grafo_completo
-from algoritmos.aco import ACO
-from algoritmos.genetico import AlgoritmoGenetico
+from utils.cache_grafo import CacheGrafos
+from algoritmos.registro import SOLVERS, SOLVERS_PADRAO, Orcamento, criar_solver, listar_solvers
+from algoritmos.exato import LIMITE_DP, resolver_exato, limite_inferior, calcular_gap
+from algoritmos.comparacao import comparar_em_paralelo
+from utils.convergencia import observador_impressao
+from utils.perfil import ativar_perfil, desativar_perfil, fase
 from utils.mapa_visualizacao import (
     gerar_mapa_comparativo,
     gerar_mapa_multirotas
@@ -32,7 +39,7 @@ def gerar_grafico_comparativo():
 
     plt.xlabel("Algoritmo")
     plt.ylabel("Valor")
-    plt.title("Comparação de Métricas: ACO vs Genético")
+    plt.title("Comparação de Métricas: " + " vs ".join(algoritmos))
     plt.xticks([i + bar_width for i in index], algoritmos)
     plt.legend()
     plt.tight_layout()
@@ -40,6 +47,24 @@ def gerar_grafico_comparativo():
     plt.close()
     print("📊 Gráfico comparativo salvo como grafico_comparativo.png")
 
+def gerar_grafico_convergencia(resultados):
+    plt.figure(figsize=(10, 6))
+    # Solvers sem traço (o exato, por exemplo) ficam de fora do gráfico
+    resultados = [resultado for resultado in resultados if resultado.convergencia is not None]
+    for resultado in resultados:
+        traco = resultado.convergencia
+        plt.plot(traco["iteracao"], traco["melhor"], label=f"{resultado.algoritmo} (melhor)")
+        plt.plot(traco["iteracao"], traco["media"], linestyle="--", alpha=0.6, label=f"{resultado.algoritmo} (média)")
+
+    plt.xlabel("Iteração / Geração")
+    plt.ylabel("Distância")
+    plt.title("Convergência: " + " vs ".join(resultado.algoritmo for resultado in resultados))
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig("grafico_convergencia.png")
+    plt.close()
+    print("📈 Gráfico de convergência salvo como grafico_convergencia.png")
+
 def gerar_html_tabela_comparativa():
     df = pd.read_csv("tabela_comparativa.csv")
 
@@ -47,7 +72,7 @@ def gerar_html_tabela_comparativa():
     <html>
     <head>
         <meta charset=\"UTF-8\">
-        <title>Tabela Comparativa - ACO e GA</title>
+        <title>Tabela Comparativa dos Algoritmos</title>
         <style>
             body {
                 font-family: Arial, sans-serif;
@@ -84,15 +109,16 @@ def gerar_html_tabela_comparativa():
         </style>
     </head>
     <body>
-        <h2>Tabela Comparativa - ACO x Algoritmo Genético</h2>
+        <h2>Tabela Comparativa dos Algoritmos</h2>
         <table>
             <tr>
                 <th>Algoritmo</th>
                 <th>Distância Base</th>
                 <th>Custo Extra</th>
                 <th>Custo Total</th>
+                <th>Gap (%)</th>
                 <th>Tempo Execução (s)</th>
-                <th>Iterações/Formigas</th>
+                <th>Iterações</th>
                 <th>Melhor Rota</th>
             </tr>
     """
@@ -104,8 +130,9 @@ def gerar_html_tabela_comparativa():
             <td>{row['Distância Base']}</td>
             <td>{row['Custo Extra']}</td>
             <td>{row['Custo Total']}</td>
+            <td>{row['Gap (%)']}</td>
             <td>{row['Tempo Execução (s)']}</td>
-            <td>{row['Iterações/Formigas']}</td>
+            <td>{row['Iterações']}</td>
             <td>{row['Melhor Rota']}</td>
         </tr>
         """
@@ -114,6 +141,8 @@ def gerar_html_tabela_comparativa():
         </table>
         <h3>Gráfico Comparativo</h3>
         <img src=\"grafico_comparativo.png\" alt=\"Gráfico Comparativo\">
+        <h3>Convergência</h3>
+        <img src=\"grafico_convergencia.png\" alt=\"Gráfico de Convergência\">
     </body>
     </html>
     """
@@ -123,12 +152,7 @@ def gerar_html_tabela_comparativa():
 
     print("📄 Tabela HTML com gráfico gerada com sucesso: tabela_comparativa_render.html")
 
-def main():
-    print("\n=== OTIMIZAÇÃO DE ROTAS — ALTO PARANAÍBA ===")
-
-    grafo = carregar_grafo('data/grafo.json')
-    grafo = tornar_grafo_bidirecional(grafo)
-
+def ler_estradas_bloqueadas():
     print("\nInforme as estradas bloqueadas no formato: Cidade1-Cidade2")
     print("Digite 'ok' quando terminar.\n")
     estradas_bloqueadas = []
@@ -144,7 +168,9 @@ def main():
             print(f"Estrada {cidade1} ↔ {cidade2} bloqueada!")
         except:
             print("Formato inválido. Use o formato: Cidade1-Cidade2")
+    return estradas_bloqueadas
 
+def ler_custos_extras():
     print("\nInforme custos extras no formato: Cidade1-Cidade2-Custo")
     print("Digite 'ok' quando terminar.\n")
     custos_extras = []
@@ -161,75 +187,168 @@ def main():
             print(f"Custo extra de {custo} aplicado na estrada {cidade1} ↔ {cidade2}")
         except:
             print("Formato inválido. Use: Cidade1-Cidade2-Custo")
+    return custos_extras
+
+def calcular_referencia(matriz, origem="Patrocínio", cancelamento=None):
+    # Ótimo exato só quando cabe no Held–Karp; acima disso, o limite inferior (sem branch-and-bound)
+    if len(matriz) <= LIMITE_DP:
+        return resolver_exato(matriz, origem, cancelamento=cancelamento)["distancia"], True
+    return limite_inferior(matriz, especial=matriz.indice[origem])[0], False
+
+def resolver_cenario(matriz, referencia=None, semente=None, verboso=False, observadores=(), cancelamento=None,
+                     paralelo=True, solvers=SOLVERS_PADRAO, orcamento=None, origem="Patrocínio"):
+    # Todos os solvers partem da mesma semente, registrada em cada resultado
+    if semente is None:
+        semente = np.random.SeedSequence().entropy
+    opcoes = dict(origem=origem, semente=semente, limite_inferior=referencia)
+    rotulos = [SOLVERS[nome].rotulo for nome in solvers]
+
+    if paralelo and len(solvers) > 1:
+        # Os solvers rodam ao mesmo tempo, em processos que compartilham a matriz de distâncias
+        observadores = list(observadores)
+        if verboso:
+            print(f"\n>>> Executando em paralelo: {', '.join(rotulos)}...")
+            observadores.append(observador_impressao("Iteração", com_algoritmo=True))
+        with fase(" + ".join(rotulos)):
+            por_nome = comparar_em_paralelo(matriz, [(nome, opcoes) for nome in solvers], orcamento,
+                                            observadores=observadores, cancelamento=cancelamento)
+        resultados = [por_nome[nome] for nome in solvers]
+    else:
+        resultados = []
+        for nome in solvers:
+            observadores_solver = [observador_impressao(SOLVERS[nome].unidade)] if verboso else []
+            observadores_solver.extend(observadores)
+            solver = criar_solver(nome, matriz, observadores=observadores_solver, cancelamento=cancelamento, **opcoes)
+
+            if verboso:
+                print(f"\n>>> Executando {solver.rotulo}...")
+            with fase(solver.rotulo):
+                resultados.append(solver.resolver(orcamento))
+            if cancelamento is not None and cancelamento.is_set():
+                return resultados
+
+    if verboso:
+        print()
+        for nome, resultado in zip(solvers, resultados):
+            print(f"{resultado.algoritmo} parou por {resultado.motivo_parada} (última melhoria na "
+                  f"{SOLVERS[nome].unidade.lower()} {resultado.iteracao_melhoria}, {resultado.tempo:.2f}s)")
+
+    return resultados
+
+def calcular_custo_extra(rota, grafo_restrito, grafo_com_custos):
+    custo_extra = 0
+    for i in range(len(rota) - 1):
+        origem = rota[i]
+        destino = rota[i + 1]
+        custo_base = grafo_restrito.get(origem, {}).get(destino, 9999)
+        custo_modificado = grafo_com_custos.get(origem, {}).get(destino, 9999)
+        custo_extra += (custo_modificado - custo_base)
+    return custo_extra
+
+def executar_cenario(estradas_bloqueadas, custos_extras, verboso=True, observadores=(), cancelamento=None,
+                     solvers=SOLVERS_PADRAO, orcamento=None):
+    grafo = carregar_grafo('data/grafo.json')
+    grafo = tornar_grafo_bidirecional(grafo)
 
     grafo_restrito = aplicar_restricoes(grafo, estradas_bloqueadas)
     grafo_com_custos = aplicar_custos_extras(grafo_restrito, custos_extras)
-    grafo_completo = gerar_grafo_completo(grafo_com_custos)
-
-    print("\n>>> Executando ACO...")
-    aco = ACO(grafo_completo, num_formigas=50, num_iteracoes=500)
-    resultado_aco = aco.executar()
-
-    print("\n>>> Executando Algoritmo Genético...")
-    ga = AlgoritmoGenetico(grafo_completo, tamanho_populacao=300, taxa_mutacao=0.02, num_geracoes=500)
-    resultado_ga = ga.executar()
-
-    def calcular_custo_extra(rota):
-        custo_extra = 0
-        for i in range(len(rota) - 1):
-            origem = rota[i]
-            destino = rota[i + 1]
-            custo_base = grafo_restrito.get(origem, {}).get(destino, 9999)
-            custo_modificado = grafo_com_custos.get(origem, {}).get(destino, 9999)
-            custo_extra += (custo_modificado - custo_base)
-        return custo_extra
-
-    resultados = []
-    for nome_alg, resultado, iteracoes in [
-        ("ACO", resultado_aco, 200),
-        ("Genético", resultado_ga, 500)
-    ]:
-        custo_extra = calcular_custo_extra(resultado['melhor_rota'])
-        distancia_base = resultado["distancia"] - custo_extra
-        resultados.append({
-            "Algoritmo": nome_alg,
+    with fase("cache_grafo"):
+        fechamento = CacheGrafos().carregar_fechamento('data/grafo.json', estradas_bloqueadas, custos_extras)
+        matriz = fechamento.matriz_distancias()
+
+    # Cancelado: não sobrescreve os relatórios e mapas da última execução completa
+    if cancelamento is not None and cancelamento.is_set():
+        return None
+    with fase("solucao_exata"):
+        referencia, exata = calcular_referencia(matriz, cancelamento=cancelamento)
+    if cancelamento is not None and cancelamento.is_set():
+        return None
+    if verboso and exata:
+        print(f"\nDistância ótima (solução exata): {referencia}")
+    elif verboso:
+        print(f"\nLimite inferior (Held–Karp): {referencia:.2f}")
+
+    resultados = resolver_cenario(
+        matriz, referencia, verboso=verboso, observadores=observadores, cancelamento=cancelamento,
+        solvers=solvers, orcamento=orcamento
+    )
+    # Cancelado: não sobrescreve os relatórios e mapas da última execução completa
+    if cancelamento is not None and cancelamento.is_set():
+        return None
+
+    linhas = []
+    for resultado in resultados:
+        custo_extra = calcular_custo_extra(resultado.melhor_rota, grafo_restrito, grafo_com_custos)
+        distancia_base = resultado.distancia - custo_extra
+        linhas.append({
+            "Algoritmo": resultado.algoritmo,
             "Distância Base": distancia_base,
             "Custo Extra": custo_extra,
-            "Custo Total": resultado["distancia"],
-            "Tempo Execução (s)": round(resultado["tempo"], 2),
-            "Iterações/Formigas": iteracoes,
-            "Melhor Rota": ' → '.join(resultado["melhor_rota"])
+            "Custo Total": resultado.distancia,
+            "Gap (%)": round(calcular_gap(resultado.distancia, referencia), 2),
+            "Tempo Execução (s)": round(resultado.tempo, 2),
+            "Iterações": resultado.iteracoes,
+            "Melhor Rota": ' → '.join(resultado.melhor_rota)
         })
 
-    df = pd.DataFrame(resultados)
-    df.to_csv("tabela_comparativa.csv", index=False)
-    gerar_grafico_comparativo()
-    gerar_html_tabela_comparativa()
+    with fase("relatorios"):
+        df = pd.DataFrame(linhas)
+        df.to_csv("tabela_comparativa.csv", index=False)
+        gerar_grafico_comparativo()
+        gerar_grafico_convergencia(resultados)
+        gerar_html_tabela_comparativa()
 
-    print("\n=== TABELA COMPARATIVA ===")
-    print(df)
+    if verboso:
+        print("\n=== TABELA COMPARATIVA ===")
+        print(df)
 
     # 🗺️ Mapas
-    gerar_mapa_comparativo(
-        resultado_aco['melhor_rota'],
-        resultado_ga['melhor_rota'],
-        estradas_bloqueadas,
-        nome_arquivo="mapa_comparativo.html"
-    )
+    with fase("mapas"):
+        gerar_mapa_comparativo(
+            [(resultado.algoritmo, resultado.melhor_rota) for resultado in resultados],
+            estradas_bloqueadas,
+            nome_arquivo="mapa_comparativo.html"
+        )
 
-    gerar_mapa_multirotas(
-        resultado_aco['top3_rotas'],
-        estradas_bloqueadas,
-        nome_arquivo="mapa_aco_top3.html",
-        algoritmo="ACO"
-    )
+        for nome, resultado in zip(solvers, resultados):
+            gerar_mapa_multirotas(
+                resultado.top3_rotas,
+                estradas_bloqueadas,
+                nome_arquivo=f"mapa_{nome}_top3.html",
+                algoritmo=resultado.algoritmo
+            )
 
-    gerar_mapa_multirotas(
-        resultado_ga['top3_rotas'],
-        estradas_bloqueadas,
-        nome_arquivo="mapa_genetico_top3.html",
-        algoritmo="Genético"
-    )
+    return resultados, referencia
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimização de rotas no Alto Paranaíba")
+    parser.add_argument("--solvers", nargs="+", default=list(SOLVERS_PADRAO), choices=list(SOLVERS))
+    parser.add_argument("--listar-solvers", action="store_true", help="mostra os solvers registrados e sai")
+    parser.add_argument("--iteracoes", type=int, default=None)
+    parser.add_argument("--tempo-limite", type=float, default=None, help="orçamento em segundos por solver")
+    argumentos = parser.parse_args()
+
+    if argumentos.listar_solvers:
+        for nome, rotulo, descricao in listar_solvers():
+            print(f"{nome:>14}  {rotulo:<18} {descricao}")
+        return
+
+    print("\n=== OTIMIZAÇÃO DE ROTAS — ALTO PARANAÍBA ===")
+
+    # PERFIL=1 mede cada fase da execução e grava perfil.json e perfil.folded
+    if os.environ.get("PERFIL"):
+        ativar_perfil()
+
+    estradas_bloqueadas = ler_estradas_bloqueadas()
+    custos_extras = ler_custos_extras()
+    executar_cenario(estradas_bloqueadas, custos_extras, solvers=argumentos.solvers,
+                     orcamento=Orcamento(argumentos.iteracoes, argumentos.tempo_limite))
+
+    perfil = desativar_perfil()
+    if perfil is not None:
+        perfil.salvar_json("perfil.json")
+        perfil.salvar_flamegraph("perfil.folded")
+        print("⏱️ Perfil de execução salvo em perfil.json e perfil.folded")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,272 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from algoritmos.registro import SOLVERS, SOLVERS_PADRAO, Orcamento, criar_solver, listar_solvers
+from utils.cache_grafo import CacheGrafos
+
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+# O pool não tem cancelamento: sem teto, um pedido "exato" prenderia um processo indefinidamente
+TEMPO_MAXIMO_EXATO = 60.0
+
+STATUS_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# Estado quente de cada processo do pool: o fechamento base e os cenários recentes
+fechamento_base = None
+
+
+def iniciar_trabalhador(fechamento):
+    global fechamento_base
+    fechamento_base = fechamento
+
+
+def aquecer():
+    return os.getpid()
+
+
+@lru_cache(maxsize=64)
+def matriz_cenario(estradas_bloqueadas, custos_extras):
+    return fechamento_base.atualizar(estradas_bloqueadas, custos_extras).matriz_distancias()
+
+
+def resolver_pedido(pedido):
+    inicio = time.perf_counter()
+    matriz = matriz_cenario(pedido["estradas_bloqueadas"], pedido["custos_extras"])
+    algoritmos = pedido["algoritmos"]
+    tempo_limite = pedido["tempo_limite"]
+    # O orçamento de tempo do pedido é dividido igualmente entre os solvers
+    if tempo_limite is not None:
+        tempo_limite /= len(algoritmos)
+    orcamento = Orcamento(tempo_limite=tempo_limite)
+
+    resultados = []
+    for algoritmo in algoritmos:
+        solver = criar_solver(algoritmo, matriz, origem=pedido["origem"], semente=pedido["semente"])
+        resultados.append((algoritmo, solver.resolver(orcamento)))
+
+    algoritmo, melhor = min(resultados, key=lambda item: item[1].distancia)
+    return {
+        "algoritmo": algoritmo,
+        "melhor_rota": melhor.melhor_rota,
+        "distancia": melhor.distancia,
+        "top3_rotas": melhor.top3_rotas,
+        "iteracoes": melhor.iteracoes,
+        "motivo_parada": melhor.motivo_parada,
+        "semente": str(melhor.semente),
+        "tempo": time.perf_counter() - inicio,
+    }
+
+
+class PedidoInvalido(Exception):
+    pass
+
+
+class ServicoRotas:
+    def __init__(self, caminho_grafo="data/grafo.json", processos=None, diretorio_cache=".cache_grafos"):
+        self.fechamento = CacheGrafos(diretorio_cache).carregar_fechamento(caminho_grafo)
+        self.processos = processos or os.cpu_count() or 1
+        self.executor = None
+        self.em_andamento = {}
+        self.coalescidos = 0
+
+    async def iniciar(self):
+        self.executor = ProcessPoolExecutor(
+            self.processos, initializer=iniciar_trabalhador, initargs=(self.fechamento,)
+        )
+        # Sobe todos os processos já na partida, para o primeiro pedido não pagar imports e fechamento
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, aquecer) for _ in range(self.processos)))
+
+    def fechar(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def normalizar(self, dados):
+        if not isinstance(dados, dict):
+            raise PedidoInvalido("O corpo deve ser um objeto JSON")
+        cidades = self.fechamento.indice
+
+        origem = dados.get("origem", "Patrocínio")
+        if not isinstance(origem, str) or origem not in cidades:
+            raise PedidoInvalido(f"Cidade de origem desconhecida: {origem}")
+
+        try:
+            # Estradas não têm sentido: A-B e B-A são o mesmo bloqueio
+            bloqueadas = tuple(sorted({tuple(sorted((c1, c2))) for c1, c2 in dados.get("estradas_bloqueadas", [])}))
+            custos = tuple(sorted((*sorted((c1, c2)), float(custo)) for c1, c2, custo in dados.get("custos_extras", [])))
+            for estrada in bloqueadas + tuple(custo[:2] for custo in custos):
+                for cidade in estrada:
+                    if not isinstance(cidade, str):
+                        raise TypeError(cidade)
+        except (TypeError, ValueError):
+            raise PedidoInvalido("Use [[cidade1, cidade2], ...] e [[cidade1, cidade2, custo], ...]")
+        for estrada in bloqueadas + tuple(custo[:2] for custo in custos):
+            for cidade in estrada:
+                if cidade not in cidades:
+                    raise PedidoInvalido(f"Cidade desconhecida: {cidade}")
+
+        # Um solver do registro, uma lista deles ou "ambos" (a comparação padrão)
+        algoritmo = dados.get("algoritmo", "aco")
+        if algoritmo == "ambos":
+            algoritmos = SOLVERS_PADRAO
+        elif isinstance(algoritmo, list) and algoritmo:
+            algoritmos = tuple(algoritmo)
+        else:
+            algoritmos = (algoritmo,)
+        for nome in algoritmos:
+            if not isinstance(nome, str) or nome not in SOLVERS:
+                raise PedidoInvalido(f"Algoritmo desconhecido: {nome} (disponíveis: {', '.join(SOLVERS)})")
+
+        tempo_limite = dados.get("tempo_limite")
+        semente = dados.get("semente")
+        try:
+            tempo_limite = None if tempo_limite is None else float(tempo_limite)
+            semente = None if semente is None else int(semente)
+        except (TypeError, ValueError):
+            raise PedidoInvalido("tempo_limite deve ser número e semente, inteiro")
+        if "exato" in algoritmos:
+            tempo_limite = min(tempo_limite or TEMPO_MAXIMO_EXATO, TEMPO_MAXIMO_EXATO)
+
+        return {
+            "origem": origem,
+            "estradas_bloqueadas": bloqueadas,
+            "custos_extras": custos,
+            "algoritmos": algoritmos,
+            "tempo_limite": tempo_limite,
+            "semente": semente,
+        }
+
+    async def resolver(self, pedido):
+        chave = json.dumps(pedido, sort_keys=True, ensure_ascii=False)
+        tarefa = self.em_andamento.get(chave)
+        coalescido = tarefa is not None
+
+        # Pedidos idênticos simultâneos esperam pela mesma execução no pool
+        if tarefa is None:
+            loop = asyncio.get_running_loop()
+            tarefa = asyncio.ensure_future(loop.run_in_executor(self.executor, resolver_pedido, pedido))
+            self.em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda _: self.em_andamento.pop(chave, None))
+        else:
+            self.coalescidos += 1
+
+        resultado = await asyncio.shield(tarefa)
+        return dict(resultado, coalescido=coalescido)
+
+    async def tratar(self, metodo, caminho, corpo):
+        if caminho == "/saude":
+            if metodo != "GET":
+                return 405, {"erro": "Use GET"}
+            return 200, {
+                "status": "ok",
+                "cidades": len(self.fechamento.cidades),
+                "processos": self.processos,
+                "em_andamento": len(self.em_andamento),
+                "coalescidos": self.coalescidos,
+            }
+
+        if caminho == "/solvers":
+            if metodo != "GET":
+                return 405, {"erro": "Use GET"}
+            return 200, {
+                "solvers": [
+                    {"nome": nome, "rotulo": rotulo, "descricao": descricao}
+                    for nome, rotulo, descricao in listar_solvers()
+                ]
+            }
+
+        if caminho == "/rotas":
+            if metodo != "POST":
+                return 405, {"erro": "Use POST"}
+            try:
+                pedido = self.normalizar(json.loads(corpo or b"{}"))
+            except json.JSONDecodeError:
+                return 400, {"erro": "JSON inválido"}
+            except PedidoInvalido as erro:
+                return 400, {"erro": str(erro)}
+            try:
+                return 200, await self.resolver(pedido)
+            except Exception as erro:
+                return 500, {"erro": f"{type(erro).__name__}: {erro}"}
+
+        return 404, {"erro": f"Caminho desconhecido: {caminho}"}
+
+    async def atender(self, leitor, escritor):
+        try:
+            try:
+                linha = await leitor.readline()
+                if not linha:
+                    return
+                metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+                tamanho = int(cabecalhos.get("content-length", 0))
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    status, resposta = 413, {"erro": "Corpo grande demais"}
+                else:
+                    corpo = await leitor.readexactly(tamanho) if tamanho else b""
+                    status, resposta = await self.tratar(metodo, caminho.split("?", 1)[0], corpo)
+            except (ValueError, asyncio.IncompleteReadError):
+                status, resposta = 400, {"erro": "Requisição HTTP malformada"}
+            except Exception as erro:
+                status, resposta = 500, {"erro": f"{type(erro).__name__}: {erro}"}
+
+            conteudo = json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+            escritor.write(
+                f"HTTP/1.1 {status} {STATUS_HTTP[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(conteudo)}\r\n"
+                f"Connection: close\r\n\r\n".encode("latin-1") + conteudo
+            )
+            await escritor.drain()
+        finally:
+            # Fecha a conexão mesmo se a leitura ou a escrita falharem
+            escritor.close()
+
+
+async def servir(host="127.0.0.1", porta=8000, caminho_grafo="data/grafo.json", processos=None):
+    servico = ServicoRotas(caminho_grafo, processos)
+    await servico.iniciar()
+    servidor = await asyncio.start_server(servico.atender, host, porta)
+    print(f"🚚 Serviço de rotas em http://{host}:{porta} ({servico.processos} processos)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servico.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de planejamento de rotas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--grafo", default="data/grafo.json")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: número de CPUs")
+    argumentos = parser.parse_args()
+
+    try:
+        asyncio.run(servir(argumentos.host, argumentos.porta, argumentos.grafo, argumentos.processos))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
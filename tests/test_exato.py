@@ -0,0 +1,78 @@
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from algoritmos.exato import branch_and_bound, held_karp, limite_inferior, resolver_exato
+from utils.matriz_distancias import MatrizDistancias
+
+
+def matriz_aleatoria(n, semente, inteira=True):
+    rng = np.random.default_rng(semente)
+    pontos = rng.uniform(0, 100, size=(n, 2))
+    distancias = np.linalg.norm(pontos[:, None] - pontos[None, :], axis=2)
+    if inteira:
+        distancias = np.round(distancias)
+    return MatrizDistancias([f"C{i}" for i in range(n)], distancias)
+
+
+def custo_rota(distancias, rota):
+    return float(distancias[rota[:-1], rota[1:]].sum())
+
+
+def forca_bruta(distancias, origem):
+    outros = [i for i in range(len(distancias)) if i != origem]
+    return min(custo_rota(distancias, np.array([origem, *ordem, origem])) for ordem in permutations(outros))
+
+
+@pytest.mark.parametrize("n", range(4, 9))
+@pytest.mark.parametrize("semente", range(4))
+def test_held_karp_igual_forca_bruta(n, semente):
+    matriz = matriz_aleatoria(n, semente)
+    origem = semente % n
+    rota, custo = held_karp(matriz.distancias, origem)
+
+    assert custo == pytest.approx(forca_bruta(matriz.distancias, origem))
+    assert rota[0] == rota[-1] == origem
+    assert sorted(rota[:-1]) == list(range(n))
+    assert custo_rota(matriz.distancias, rota) == pytest.approx(custo)
+
+
+@pytest.mark.parametrize("n", range(4, 9))
+@pytest.mark.parametrize("semente", range(4))
+@pytest.mark.parametrize("inteira", [True, False])
+def test_branch_and_bound_igual_forca_bruta(n, semente, inteira):
+    matriz = matriz_aleatoria(n, semente, inteira)
+    otimo = forca_bruta(matriz.distancias, 0)
+    # Rota inicial ruim de propósito, para a busca ter de melhorá-la
+    rota_inicial = np.array([0, *range(n - 1, 0, -1), 0], dtype=np.intp)
+    _, pi = limite_inferior(matriz, custo_rota(matriz.distancias, rota_inicial))
+
+    rota, custo, motivo = branch_and_bound(matriz.distancias, 0, rota_inicial, pi)
+
+    assert motivo == "otimo"
+    assert custo == pytest.approx(otimo)
+    assert sorted(rota[:-1]) == list(range(n))
+    assert custo_rota(matriz.distancias, rota) == pytest.approx(custo)
+
+
+@pytest.mark.parametrize("semente", range(4))
+def test_resolver_exato_e_limite_inferior(semente):
+    matriz = matriz_aleatoria(8, semente)
+    otimo = forca_bruta(matriz.distancias, 0)
+
+    # limite_dp=0 força o branch-and-bound; o padrão usa Held–Karp
+    assert resolver_exato(matriz, "C0")["distancia"] == pytest.approx(otimo)
+    assert resolver_exato(matriz, "C0", limite_dp=0)["distancia"] == pytest.approx(otimo)
+    assert limite_inferior(matriz)[0] <= otimo + 1e-6
+
+
+@pytest.mark.parametrize("n", range(4, 9))
+@pytest.mark.parametrize("semente", range(4))
+def test_limite_inferior_inteiro_com_custos_inteiros(n, semente):
+    matriz = matriz_aleatoria(n, semente)
+    limite = limite_inferior(matriz)[0]
+
+    # Arredondado para cima sem passar do ótimo
+    assert limite == int(limite)
+    assert limite <= forca_bruta(matriz.distancias, 0)
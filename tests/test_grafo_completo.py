@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.grafo_completo import calcular_fechamento
+from utils.grafo_utils import aplicar_custos_extras, aplicar_restricoes, carregar_grafo, tornar_grafo_bidirecional
+from utils.instancias import gerar_grafo_geometrico
+
+CAMINHO_GRAFO = os.path.join(os.path.dirname(__file__), "..", "data", "grafo.json")
+
+
+def sortear_cenario(grafo, rng, custo_negativo=False):
+    estradas = sorted({tuple(sorted((a, b))) for a, vizinhos in grafo.items() for b in vizinhos})
+    escolhidas = rng.choice(len(estradas), size=min(5, len(estradas)), replace=False)
+    bloqueadas = [estradas[i] for i in escolhidas[:rng.integers(0, 3)]]
+    custos = []
+    for i in escolhidas[3:]:
+        a, b = estradas[i]
+        custo = -0.5 * grafo[a][b] if custo_negativo else float(rng.integers(1, 300))
+        custos.append((a, b, custo))
+    return bloqueadas, custos
+
+
+def comparar_com_recalculo(grafo, bloqueadas, custos):
+    base = calcular_fechamento(grafo)
+    incremental = base.atualizar(bloqueadas, custos)
+    completo = calcular_fechamento(aplicar_custos_extras(aplicar_restricoes(grafo, bloqueadas), custos))
+
+    ordem = [completo.indice[cidade] for cidade in incremental.cidades]
+    esperado = completo.distancias[np.ix_(ordem, ordem)]
+    np.testing.assert_allclose(incremental.distancias, esperado)
+
+    # Os predecessores atualizados precisam reconstruir caminhos com o custo da nova distância
+    adjacencia = incremental.adjacencia.toarray()
+    for origem in incremental.cidades:
+        for destino in incremental.cidades:
+            caminho = [incremental.indice[c] for c in incremental.caminho(origem, destino)]
+            distancia = incremental.distancias[incremental.indice[origem], incremental.indice[destino]]
+            if not caminho:
+                assert np.isinf(distancia)
+                continue
+            custo = sum(max(adjacencia[i, j], adjacencia[j, i]) for i, j in zip(caminho, caminho[1:]))
+            assert custo == pytest.approx(distancia)
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_atualizar_igual_ao_recalculo_completo(semente):
+    rng = np.random.default_rng(semente)
+    grafo, _ = gerar_grafo_geometrico(int(rng.integers(8, 30)), grau_medio=3, semente=semente)
+    comparar_com_recalculo(grafo, *sortear_cenario(grafo, rng))
+
+
+@pytest.mark.parametrize("semente", range(3))
+def test_atualizar_com_custo_negativo(semente):
+    rng = np.random.default_rng(semente)
+    grafo, _ = gerar_grafo_geometrico(15, grau_medio=3, semente=semente)
+    comparar_com_recalculo(grafo, *sortear_cenario(grafo, rng, custo_negativo=True))
+
+
+@pytest.mark.parametrize("bloqueadas, custos", [
+    ([("Araxá", "Ibiá")], []),
+    ([("Guarda-Mor", "Lagamar")], [("Patrocínio", "Coromandel", 80.0)]),
+    ([], [("Araxá", "Perdizes", 50.0), ("Ibiá", "Campos Altos", 10.0)]),
+    ([("Xyz", "Patrocínio")], []),
+])
+def test_atualizar_no_grafo_da_regiao(bloqueadas, custos):
+    grafo = tornar_grafo_bidirecional(carregar_grafo(CAMINHO_GRAFO))
+    comparar_com_recalculo(grafo, bloqueadas, custos)
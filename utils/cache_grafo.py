@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy.sparse import load_npz, save_npz
+
+from utils.grafo_completo import FechamentoMetrico, calcular_fechamento
+from utils.grafo_utils import tornar_grafo_bidirecional
+from utils.perfil import fase
+
+
+class CacheGrafos:
+    def __init__(self, diretorio=".cache_grafos", limite_bytes=512 * 1024 * 1024):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def chave(self, conteudo_grafo, estradas_bloqueadas=(), custos_extras=()):
+        bloqueios = sorted(sorted(estrada) for estrada in estradas_bloqueadas)
+        custos = sorted(sorted([cidade1, cidade2]) + [float(custo)] for cidade1, cidade2, custo in custos_extras)
+
+        h = hashlib.sha256(conteudo_grafo)
+        h.update(json.dumps([bloqueios, custos], ensure_ascii=False).encode("utf-8"))
+        return h.hexdigest()
+
+    def obter(self, chave):
+        pasta = os.path.join(self.diretorio, chave)
+        try:
+            with open(os.path.join(pasta, "cidades.json"), encoding="utf-8") as arquivo:
+                cidades = json.load(arquivo)
+            adjacencia = load_npz(os.path.join(pasta, "adjacencia.npz")).tocsr()
+            distancias = np.load(os.path.join(pasta, "distancias.npy"), mmap_mode="r")
+            predecessores = np.load(os.path.join(pasta, "predecessores.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        os.utime(pasta)
+        return FechamentoMetrico(cidades, adjacencia, distancias, predecessores)
+
+    def salvar(self, chave, fechamento):
+        pasta = os.path.join(self.diretorio, chave)
+        if os.path.isdir(pasta) or fechamento.predecessores is None:
+            return
+
+        temporaria = tempfile.mkdtemp(dir=self.diretorio, prefix=".tmp-")
+        with open(os.path.join(temporaria, "cidades.json"), "w", encoding="utf-8") as arquivo:
+            json.dump(fechamento.cidades, arquivo, ensure_ascii=False)
+        save_npz(os.path.join(temporaria, "adjacencia.npz"), fechamento.adjacencia)
+        np.save(os.path.join(temporaria, "distancias.npy"), np.ascontiguousarray(fechamento.distancias))
+        np.save(os.path.join(temporaria, "predecessores.npy"), np.ascontiguousarray(fechamento.predecessores))
+
+        try:
+            os.rename(temporaria, pasta)
+        except OSError:
+            shutil.rmtree(temporaria, ignore_errors=True)
+            return
+        self.remover_excedentes()
+
+    def remover_excedentes(self):
+        entradas = []
+        total = 0
+        for nome in os.listdir(self.diretorio):
+            pasta = os.path.join(self.diretorio, nome)
+            if nome.startswith(".") or not os.path.isdir(pasta):
+                continue
+            tamanho = sum(
+                os.path.getsize(os.path.join(pasta, arquivo)) for arquivo in os.listdir(pasta)
+            )
+            entradas.append((os.path.getmtime(pasta), tamanho, pasta))
+            total += tamanho
+
+        # Remove as entradas usadas há mais tempo até caber no limite
+        for _, tamanho, pasta in sorted(entradas):
+            if total <= self.limite_bytes:
+                break
+            shutil.rmtree(pasta, ignore_errors=True)
+            total -= tamanho
+
+    def carregar_fechamento(self, caminho_grafo, estradas_bloqueadas=(), custos_extras=()):
+        with open(caminho_grafo, "rb") as arquivo:
+            conteudo = arquivo.read()
+
+        chave = self.chave(conteudo, estradas_bloqueadas, custos_extras)
+        fechamento = self.obter(chave)
+        if fechamento is not None:
+            return fechamento
+
+        chave_base = self.chave(conteudo)
+        base = self.obter(chave_base)
+        if base is None:
+            grafo = tornar_grafo_bidirecional(json.loads(conteudo.decode("utf-8")))
+            base = calcular_fechamento(grafo)
+            self.salvar(chave_base, base)
+
+        with fase("fechamento_incremental"):
+            fechamento = base.atualizar(estradas_bloqueadas, custos_extras)
+        self.salvar(chave, fechamento)
+        return fechamento
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class TracoConvergencia:
+    def __init__(self, capacidade=100):
+        # Vetores pré-alocados; só crescem (dobrando) quando não se sabe o número de iterações
+        capacidade = max(int(capacidade or 100), 1)
+        self.tamanho = 0
+        self.iteracoes = np.empty(capacidade, dtype=np.int64)
+        self.melhores = np.empty(capacidade)
+        self.melhores_iteracao = np.empty(capacidade)
+        self.medias = np.empty(capacidade)
+        self.decorridos_ns = np.empty(capacidade, dtype=np.int64)
+
+    def __len__(self):
+        return self.tamanho
+
+    def crescer(self):
+        capacidade = 2 * len(self.iteracoes)
+        for nome in ("iteracoes", "melhores", "melhores_iteracao", "medias", "decorridos_ns"):
+            antigo = getattr(self, nome)
+            novo = np.empty(capacidade, dtype=antigo.dtype)
+            novo[:self.tamanho] = antigo[:self.tamanho]
+            setattr(self, nome, novo)
+
+    def registrar(self, iteracao, melhor, melhor_iteracao, media, decorrido_ns):
+        if self.tamanho == len(self.iteracoes):
+            self.crescer()
+        i = self.tamanho
+        self.iteracoes[i] = iteracao
+        self.melhores[i] = melhor
+        self.melhores_iteracao[i] = melhor_iteracao
+        self.medias[i] = media
+        self.decorridos_ns[i] = decorrido_ns
+        self.tamanho += 1
+
+    def para_dict(self):
+        return {
+            "iteracao": self.iteracoes[:self.tamanho],
+            "melhor": self.melhores[:self.tamanho],
+            "melhor_iteracao": self.melhores_iteracao[:self.tamanho],
+            "media": self.medias[:self.tamanho],
+            "decorrido_ns": self.decorridos_ns[:self.tamanho]
+        }
+
+
+def notificar(observadores, algoritmo, traco):
+    # Observadores recebem um dicionário com o último ponto registrado no traço
+    i = traco.tamanho - 1
+    progresso = {
+        "algoritmo": algoritmo,
+        "iteracao": int(traco.iteracoes[i]),
+        "melhor": float(traco.melhores[i]),
+        "melhor_iteracao": float(traco.melhores_iteracao[i]),
+        "media": float(traco.medias[i]),
+        "decorrido_ns": int(traco.decorridos_ns[i])
+    }
+    for observador in observadores:
+        observador(progresso)
+
+
+def observador_impressao(rotulo="Iteração", a_cada=1, com_algoritmo=False):
+    def imprimir(progresso):
+        if progresso["iteracao"] % a_cada == 0:
+            prefixo = f"[{progresso['algoritmo']}] " if com_algoritmo else ""
+            print(f"{prefixo}{rotulo} {progresso['iteracao']}: Melhor distância = {progresso['melhor']}")
+    return imprimir
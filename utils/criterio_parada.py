@@ -0,0 +1,60 @@
+import time
+
+EPSILON = 1e-9
+
+MOTIVOS_PARADA = ("max_iteracoes", "limite_inferior", "custo_alvo", "estagnacao", "tempo_limite", "cancelado")
+
+
+class CriterioParada:
+    def __init__(self, max_iteracoes=None, max_estagnacao=None, custo_alvo=None, tempo_limite=None,
+                 limite_inferior=None, cancelamento=None):
+        if max_iteracoes is None and max_estagnacao is None and custo_alvo is None and tempo_limite is None:
+            raise ValueError("Sem número de iterações, informe max_estagnacao, custo_alvo ou tempo_limite")
+
+        self.max_iteracoes = max_iteracoes
+        self.max_estagnacao = max_estagnacao
+        self.custo_alvo = custo_alvo
+        self.tempo_limite = tempo_limite
+        self.limite_inferior = limite_inferior
+        # Qualquer objeto com is_set(), como threading.Event ou multiprocessing.Event
+        self.cancelamento = cancelamento
+        self.iniciar()
+
+    def iniciar(self):
+        self.inicio = time.perf_counter()
+        self.ultima_verificacao = self.inicio
+        self.melhor_distancia = float('inf')
+        self.iteracao_melhoria = 0
+        self.motivo = None
+
+    def verificar(self, iteracao, melhor_distancia):
+        # `iteracao` conta as iterações já concluídas (a partir de 1)
+        if melhor_distancia < self.melhor_distancia - EPSILON:
+            self.melhor_distancia = melhor_distancia
+            self.iteracao_melhoria = iteracao
+
+        if self.cancelamento is not None and self.cancelamento.is_set():
+            self.motivo = "cancelado"
+        elif self.limite_inferior is not None and melhor_distancia <= self.limite_inferior + EPSILON:
+            self.motivo = "limite_inferior"
+        elif self.custo_alvo is not None and melhor_distancia <= self.custo_alvo + EPSILON:
+            self.motivo = "custo_alvo"
+        elif self.max_estagnacao is not None and iteracao - self.iteracao_melhoria >= self.max_estagnacao:
+            self.motivo = "estagnacao"
+        elif self.max_iteracoes is not None and iteracao >= self.max_iteracoes:
+            self.motivo = "max_iteracoes"
+        elif self.tempo_limite is not None:
+            # Para antes de estourar o orçamento: a próxima rodada deve durar o mesmo que a última
+            agora = time.perf_counter()
+            ultima_rodada = agora - self.ultima_verificacao
+            self.ultima_verificacao = agora
+            if agora - self.inicio + ultima_rodada > self.tempo_limite:
+                self.motivo = "tempo_limite"
+
+        return self.motivo is not None
+
+    def resumo(self):
+        return {
+            "motivo_parada": self.motivo,
+            "iteracao_melhoria": self.iteracao_melhoria
+        }
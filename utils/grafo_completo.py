@@ -1,22 +1,143 @@
-import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
 
+from utils.matriz_distancias import MatrizDistancias, SEM_CAMINHO
+from utils.perfil import fase
 
-def gerar_grafo_completo(grafo_original):
-    G = nx.Graph()
+SEM_PREDECESSOR = -9999
+
+
+class FechamentoMetrico:
+    def __init__(self, cidades, adjacencia, distancias, predecessores=None):
+        self.cidades = list(cidades)
+        self.indice = {cidade: i for i, cidade in enumerate(self.cidades)}
+        self.adjacencia = adjacencia
+        self.distancias = distancias
+        self.predecessores = predecessores
+
+    def matriz_distancias(self, sem_caminho=SEM_CAMINHO):
+        distancias = np.where(np.isinf(self.distancias), sem_caminho, self.distancias)
+        return MatrizDistancias(self.cidades, distancias)
+
+    def para_dict(self, sem_caminho=SEM_CAMINHO):
+        return self.matriz_distancias(sem_caminho).para_dict()
+
+    def caminho(self, origem, destino):
+        if self.predecessores is None:
+            raise ValueError("Fechamento calculado sem predecessores")
+
+        i = self.indice[origem]
+        j = self.indice[destino]
+        if i != j and self.predecessores[i, j] == SEM_PREDECESSOR:
+            return []
+
+        caminho = [j]
+        while j != i:
+            j = self.predecessores[i, j]
+            caminho.append(j)
+        return [self.cidades[k] for k in reversed(caminho)]
+
+    def atualizar(self, estradas_bloqueadas=(), custos_extras=()):
+        adjacencia = self.adjacencia.tolil()
+        alteradas = []
+        reducao = False
+
+        for cidade1, cidade2 in estradas_bloqueadas:
+            if cidade1 not in self.indice or cidade2 not in self.indice:
+                continue
+            i, j = self.indice[cidade1], self.indice[cidade2]
+            if adjacencia[i, j] or adjacencia[j, i]:
+                adjacencia[i, j] = 0
+                adjacencia[j, i] = 0
+                alteradas.append((i, j))
+
+        for cidade1, cidade2, custo in custos_extras:
+            if cidade1 not in self.indice or cidade2 not in self.indice:
+                continue
+            i, j = self.indice[cidade1], self.indice[cidade2]
+            if adjacencia[i, j] or adjacencia[j, i]:
+                if adjacencia[i, j]:
+                    adjacencia[i, j] += custo
+                if adjacencia[j, i]:
+                    adjacencia[j, i] += custo
+                alteradas.append((i, j))
+                reducao = reducao or custo < 0
+
+        adjacencia = adjacencia.tocsr()
+        adjacencia.eliminate_zeros()
+
+        if not alteradas:
+            return FechamentoMetrico(self.cidades, adjacencia, self.distancias, self.predecessores)
+        if reducao or self.predecessores is None:
+            return resolver_fechamento(self.cidades, adjacencia, self.predecessores is not None)
+
+        # Só as origens cuja árvore de caminhos mínimos usa uma estrada alterada podem mudar
+        origens, destinos = np.array(alteradas).T
+        afetadas = (
+            (self.predecessores[:, destinos] == origens)
+            | (self.predecessores[:, origens] == destinos)
+        ).any(axis=1)
+        afetadas = np.flatnonzero(afetadas)
 
+        distancias = self.distancias.copy()
+        predecessores = self.predecessores.copy()
+        if len(afetadas):
+            novas_distancias, novos_predecessores = dijkstra(
+                adjacencia, directed=False, indices=afetadas, return_predecessors=True
+            )
+            distancias[afetadas] = novas_distancias
+            distancias[:, afetadas] = novas_distancias.T
+            predecessores[afetadas] = novos_predecessores
+
+        return FechamentoMetrico(self.cidades, adjacencia, distancias, predecessores)
+
+    def expandir_rota(self, rota):
+        caminho_real = [rota[0]]
+        for origem, destino in zip(rota, rota[1:]):
+            trecho = self.caminho(origem, destino)
+            if not trecho:
+                return []
+            caminho_real.extend(trecho[1:])
+        return caminho_real
+
+
+def montar_adjacencia(grafo_original):
+    cidades = list(grafo_original.keys())
+    for vizinhos in grafo_original.values():
+        for vizinho in vizinhos:
+            if vizinho not in grafo_original:
+                cidades.append(vizinho)
+    cidades = list(dict.fromkeys(cidades))
+    indice = {cidade: i for i, cidade in enumerate(cidades)}
+
+    linhas, colunas, pesos = [], [], []
     for cidade, vizinhos in grafo_original.items():
         for vizinho, distancia in vizinhos.items():
-            G.add_edge(cidade, vizinho, weight=distancia)
-
-    grafo_completo = {}
-    for origem in grafo_original.keys():
-        grafo_completo[origem] = {}
-        for destino in grafo_original.keys():
-            if origem != destino:
-                try:
-                    distancia = nx.shortest_path_length(G, origem, destino, weight='weight')
-                    grafo_completo[origem][destino] = distancia
-                except nx.NetworkXNoPath:
-                    grafo_completo[origem][destino] = 9999  
-
-    return grafo_completo
+            linhas.append(indice[cidade])
+            colunas.append(indice[vizinho])
+            pesos.append(distancia)
+
+    n = len(cidades)
+    adjacencia = csr_matrix((pesos, (linhas, colunas)), shape=(n, n), dtype=np.float64)
+    return cidades, adjacencia
+
+
+def resolver_fechamento(cidades, adjacencia, com_predecessores=True):
+    if com_predecessores:
+        distancias, predecessores = dijkstra(adjacencia, directed=False, return_predecessors=True)
+    else:
+        distancias = dijkstra(adjacencia, directed=False)
+        predecessores = None
+
+    return FechamentoMetrico(cidades, adjacencia, distancias, predecessores)
+
+
+def calcular_fechamento(grafo_original, com_predecessores=True):
+    with fase("fechamento"):
+        cidades, adjacencia = montar_adjacencia(grafo_original)
+        return resolver_fechamento(cidades, adjacencia, com_predecessores)
+
+
+def gerar_grafo_completo(grafo_original):
+    return calcular_fechamento(grafo_original, com_predecessores=False).para_dict()
@@ -1,45 +1,97 @@
 import json
+from collections.abc import Mapping
+
 import networkx as nx
 import matplotlib.pyplot as plt
 
+from utils.perfil import fase
+
 
 def carregar_grafo(caminho_arquivo):
-    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+    with fase("carregar_grafo"), open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
         grafo = json.load(arquivo)
     return grafo
 
 
 def tornar_grafo_bidirecional(grafo):
     grafo_bidirecional = {}
-    for cidade, vizinhos in grafo.items():
-        if cidade not in grafo_bidirecional:
-            grafo_bidirecional[cidade] = {}
-        for vizinho, distancia in vizinhos.items():
-            grafo_bidirecional[cidade][vizinho] = distancia
-            if vizinho not in grafo_bidirecional:
-                grafo_bidirecional[vizinho] = {}
-            grafo_bidirecional[vizinho][cidade] = distancia
+    with fase("tornar_grafo_bidirecional"):
+        for cidade, vizinhos in grafo.items():
+            if cidade not in grafo_bidirecional:
+                grafo_bidirecional[cidade] = {}
+            for vizinho, distancia in vizinhos.items():
+                grafo_bidirecional[cidade][vizinho] = distancia
+                if vizinho not in grafo_bidirecional:
+                    grafo_bidirecional[vizinho] = {}
+                grafo_bidirecional[vizinho][cidade] = distancia
     return grafo_bidirecional
 
 
+class VizinhosSobrepostos(Mapping):
+    def __init__(self, vizinhos, bloqueados, extras):
+        self.vizinhos = vizinhos
+        self.bloqueados = bloqueados
+        self.extras = extras
+
+    def __getitem__(self, vizinho):
+        if vizinho in self.bloqueados:
+            raise KeyError(vizinho)
+        return self.vizinhos[vizinho] + self.extras.get(vizinho, 0)
+
+    def __iter__(self):
+        for vizinho in self.vizinhos:
+            if vizinho not in self.bloqueados:
+                yield vizinho
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class GrafoSobreposto(Mapping):
+    def __init__(self, base, estradas_bloqueadas=(), custos_extras=()):
+        if isinstance(base, GrafoSobreposto):
+            estradas_bloqueadas = base.estradas_bloqueadas + list(estradas_bloqueadas)
+            custos_extras = base.custos_extras + list(custos_extras)
+            base = base.base
+
+        self.base = base
+        self.estradas_bloqueadas = list(estradas_bloqueadas)
+        self.custos_extras = list(custos_extras)
+
+        self.bloqueados = {}
+        for cidade1, cidade2 in self.estradas_bloqueadas:
+            self.bloqueados.setdefault(cidade1, set()).add(cidade2)
+            self.bloqueados.setdefault(cidade2, set()).add(cidade1)
+
+        self.extras = {}
+        for cidade1, cidade2, custo in self.custos_extras:
+            for origem, destino in ((cidade1, cidade2), (cidade2, cidade1)):
+                extras = self.extras.setdefault(origem, {})
+                extras[destino] = extras.get(destino, 0) + custo
+
+    def __getitem__(self, cidade):
+        vizinhos = self.base[cidade]
+        if cidade not in self.bloqueados and cidade not in self.extras:
+            return vizinhos
+        return VizinhosSobrepostos(
+            vizinhos, self.bloqueados.get(cidade, ()), self.extras.get(cidade, {})
+        )
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+
 def aplicar_restricoes(grafo, estradas_bloqueadas):
-    grafo_restrito = json.loads(json.dumps(grafo))  
-    for cidade1, cidade2 in estradas_bloqueadas:
-        if cidade2 in grafo_restrito.get(cidade1, {}):
-            del grafo_restrito[cidade1][cidade2]
-        if cidade1 in grafo_restrito.get(cidade2, {}):
-            del grafo_restrito[cidade2][cidade1]
-    return grafo_restrito
+    with fase("aplicar_restricoes"):
+        return GrafoSobreposto(grafo, estradas_bloqueadas=estradas_bloqueadas)
 
 
 def aplicar_custos_extras(grafo, custos_extras):
-    grafo_modificado = json.loads(json.dumps(grafo))  
-    for cidade1, cidade2, custo in custos_extras:
-        if cidade2 in grafo_modificado.get(cidade1, {}):
-            grafo_modificado[cidade1][cidade2] += custo
-        if cidade1 in grafo_modificado.get(cidade2, {}):
-            grafo_modificado[cidade2][cidade1] += custo
-    return grafo_modificado
+    with fase("aplicar_custos_extras"):
+        return GrafoSobreposto(grafo, custos_extras=custos_extras)
 
 
 def desenhar_grafo(grafo):
@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+from scipy.sparse.csgraph import minimum_spanning_tree
+
+from utils.coordenadas import coordenadas
+from utils.matriz_distancias import MatrizDistancias
+
+RAIO_TERRA_KM = 6371.0
+
+# Ótimos conhecidos de instâncias clássicas da TSPLIB
+OTIMOS_TSPLIB = {
+    "burma14": 3323,
+    "ulysses16": 6859,
+    "gr17": 2085,
+    "ulysses22": 7013,
+    "gr24": 1272,
+    "bayg29": 1610,
+    "bays29": 2020,
+    "dantzig42": 699,
+    "att48": 10628,
+    "eil51": 426,
+    "berlin52": 7542,
+    "st70": 675,
+    "eil76": 538,
+    "pr76": 108159,
+    "kroA100": 21282,
+    "kroB100": 22141,
+    "rd100": 7910,
+    "eil101": 629,
+    "lin105": 14379,
+    "ch130": 6110,
+    "ch150": 6528,
+    "a280": 2579,
+}
+
+
+def distancias_haversine(pontos):
+    lat = np.radians(pontos[:, 0])
+    lon = np.radians(pontos[:, 1])
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def gerar_grafo_geometrico(num_cidades, grau_medio=3, semente=None, fator_sinuosidade=1.25):
+    rng = np.random.default_rng(semente)
+
+    # Mesma densidade de cidades da região do Alto Paranaíba: a área cresce com o número de cidades
+    referencia = np.array(list(coordenadas.values()))
+    centro = referencia.mean(axis=0)
+    meia_largura = (referencia.max(axis=0) - referencia.min(axis=0)) / 2
+    meia_largura *= math.sqrt(num_cidades / len(referencia))
+    pontos = centro + rng.uniform(-1, 1, size=(num_cidades, 2)) * meia_largura
+
+    cidades = [f"Cidade {i + 1}" for i in range(num_cidades)]
+    estradas = np.maximum(np.rint(distancias_haversine(pontos) * fator_sinuosidade), 1)
+    np.fill_diagonal(estradas, 0)
+
+    # Grafo geométrico aleatório: os pares mais próximos viram estradas até atingir o grau médio,
+    # e a árvore geradora mínima garante que todas as cidades fiquem conectadas
+    ligadas = np.zeros((num_cidades, num_cidades), dtype=bool)
+    if num_cidades > 1:
+        linhas, colunas = np.triu_indices(num_cidades, 1)
+        num_estradas = min(len(linhas), max(num_cidades * grau_medio // 2, 1))
+        curtas = np.argpartition(estradas[linhas, colunas], num_estradas - 1)[:num_estradas]
+        ligadas[linhas[curtas], colunas[curtas]] = True
+        arvore = minimum_spanning_tree(estradas).tocoo()
+        ligadas[arvore.row, arvore.col] = True
+        ligadas |= ligadas.T
+
+    grafo = {
+        cidade: {cidades[j]: int(estradas[i, j]) for j in np.flatnonzero(ligadas[i])}
+        for i, cidade in enumerate(cidades)
+    }
+    posicoes = {cidade: (float(lat), float(lon)) for cidade, (lat, lon) in zip(cidades, pontos)}
+    return grafo, posicoes
+
+
+def distancias_tsplib(tipo, pontos):
+    dx = pontos[:, None, 0] - pontos[None, :, 0]
+    dy = pontos[:, None, 1] - pontos[None, :, 1]
+    euclidiana = np.sqrt(dx ** 2 + dy ** 2)
+
+    if tipo == "EUC_2D":
+        return np.floor(euclidiana + 0.5)
+    if tipo == "CEIL_2D":
+        return np.ceil(euclidiana)
+    if tipo == "ATT":
+        r = np.sqrt((dx ** 2 + dy ** 2) / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1, t)
+    if tipo == "GEO":
+        graus = np.trunc(pontos)
+        radianos = math.pi * (graus + 5.0 * (pontos - graus) / 3.0) / 180.0
+        lat, lon = radianos[:, 0], radianos[:, 1]
+        q1 = np.cos(lon[:, None] - lon[None, :])
+        q2 = np.cos(lat[:, None] - lat[None, :])
+        q3 = np.cos(lat[:, None] + lat[None, :])
+        cosseno = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(6378.388 * np.arccos(cosseno) + 1.0)
+    raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {tipo}")
+
+
+def matriz_explicita(formato, pesos, n):
+    distancias = np.zeros((n, n))
+    if formato == "FULL_MATRIX":
+        return np.array(pesos[:n * n], dtype=np.float64).reshape(n, n)
+
+    if formato in ("UPPER_ROW", "LOWER_COL"):
+        linhas, colunas = np.triu_indices(n, 1)
+    elif formato in ("LOWER_ROW", "UPPER_COL"):
+        linhas, colunas = np.tril_indices(n, -1)
+    elif formato in ("UPPER_DIAG_ROW", "LOWER_DIAG_COL"):
+        linhas, colunas = np.triu_indices(n)
+    elif formato in ("LOWER_DIAG_ROW", "UPPER_DIAG_COL"):
+        linhas, colunas = np.tril_indices(n)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT não suportado: {formato}")
+
+    distancias[linhas, colunas] = pesos[:len(linhas)]
+    distancias[colunas, linhas] = pesos[:len(linhas)]
+    return distancias
+
+
+def carregar_tsplib(caminho_arquivo):
+    cabecalho = {}
+    coordenadas_nos = []
+    pesos = []
+    secao = None
+
+    with open(caminho_arquivo, "r", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            linha = linha.strip()
+            if not linha or linha == "EOF":
+                continue
+            if linha.rstrip(" :").endswith("_SECTION"):
+                secao = linha.rstrip(" :")
+                continue
+            if ":" in linha:
+                chave, _, valor = linha.partition(":")
+                cabecalho[chave.strip()] = valor.strip()
+                continue
+            if secao == "NODE_COORD_SECTION":
+                _, x, y = linha.split()[:3]
+                coordenadas_nos.append((float(x), float(y)))
+            elif secao == "EDGE_WEIGHT_SECTION":
+                pesos.extend(float(valor) for valor in linha.split())
+
+    n = int(cabecalho["DIMENSION"])
+    tipo = cabecalho.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if tipo == "EXPLICIT":
+        distancias = matriz_explicita(cabecalho.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"), np.array(pesos), n)
+    else:
+        distancias = distancias_tsplib(tipo, np.array(coordenadas_nos[:n]))
+    np.fill_diagonal(distancias, 0)
+
+    nome = cabecalho.get("NAME", caminho_arquivo).split()[0]
+    return nome, MatrizDistancias([str(i + 1) for i in range(n)], distancias)
@@ -7,14 +7,15 @@ from utils.coordenadas import coordenadas
 def aplicar_offset(pontos, offset_lat=0, offset_lon=0):
     return [(lat + offset_lat, lon + offset_lon) for lat, lon in pontos]
 
-def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo="mapa_comparativo.html"):
-    mapa = folium.Map(location=[-18.9, -47.2], zoom_start=8)
+CORES_ROTAS = ['red', 'blue', 'purple', 'orange', 'cadetblue', 'darkred']
 
-    cor_aco = 'red'
-    cor_ga = 'blue'
+def gerar_mapa_comparativo(rotas, estradas_bloqueadas, nome_arquivo="mapa_comparativo.html"):
+    # `rotas` é uma lista de (nome do algoritmo, rota)
+    mapa = folium.Map(location=[-18.9, -47.2], zoom_start=8)
 
-    ordem_aco = {cidade: idx + 1 for idx, cidade in enumerate(rota_aco)}
-    ordem_ga = {cidade: idx + 1 for idx, cidade in enumerate(rota_ga)}
+    nomes = [nome for nome, _ in rotas]
+    cores = [CORES_ROTAS[i % len(CORES_ROTAS)] for i in range(len(rotas))]
+    ordens = [{cidade: idx + 1 for idx, cidade in enumerate(rota)} for _, rota in rotas]
 
     for cidade1, cidade2 in estradas_bloqueadas:
         try:
@@ -30,12 +31,10 @@ def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo=
         except:
             print(f"Erro ao desenhar estrada bloqueada entre {cidade1} e {cidade2}")
 
-    rotas = [rota_aco, rota_ga]
-    cores = [cor_aco, cor_ga]
-    nomes = ["ACO", "GA"]
-    offsets = [(0.002, 0.002), (-0.002, -0.002)]
+    # Desloca as rotas umas das outras para que trechos em comum continuem visíveis
+    offsets = [(0.004 * ((len(rotas) - 1) / 2 - i),) * 2 for i in range(len(rotas))]
 
-    for rota, cor, nome, (lat_off, lon_off) in zip(rotas, cores, nomes, offsets):
+    for (nome, rota), cor, (lat_off, lon_off) in zip(rotas, cores, offsets):
         pontos_originais = [coordenadas[c] for c in rota]
         pontos_offset = aplicar_offset(pontos_originais, lat_off, lon_off)
         folium.PolyLine(
@@ -48,8 +47,7 @@ def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo=
 
     for cidade, (lat, lon) in coordenadas.items():
         popup_text = f"<b>{cidade}</b><br>"
-        popup_text += f"Ordem ACO: {ordem_aco.get(cidade, 'N/A')}<br>"
-        popup_text += f"Ordem GA: {ordem_ga.get(cidade, 'N/A')}"
+        popup_text += "<br>".join(f"Ordem {nome}: {ordem.get(cidade, 'N/A')}" for nome, ordem in zip(nomes, ordens))
 
         folium.Marker(
             location=(lat, lon),
@@ -62,13 +60,13 @@ def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo=
             )
         ).add_to(mapa)
 
-    legenda_html = '''
+    legenda_rotas = ''.join(f'<i style="color:{cor};">&#9632;</i> Rota {nome}<br>' for nome, cor in zip(nomes, cores))
+    legenda_html = f'''
      <div style="
      position: fixed;
      bottom: 50px;
      left: 50px;
      width: 200px;
-     height: 180px;
      z-index:9999;
      background-color:white;
      border:2px solid grey;
@@ -76,12 +74,11 @@ def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo=
      font-size:14px;
      ">
      <b>Legenda</b><br>
-     <i style="color:red;">&#9632;</i> Rota ACO<br>
-     <i style="color:blue;">&#9632;</i> Rota GA<br>
+     {legenda_rotas}
      <i style="color:black;">&#9632;</i> Estrada Bloqueada<br>
      <i style="color:green;">&#9873;</i> Cidades<br>
      <br><b>Popup:</b><br>
-     Ordem nas rotas (ACO e GA)
+     Ordem em cada rota
      <br>
      </div>
     '''
@@ -119,7 +116,7 @@ def gerar_mapa_comparativo(rota_aco, rota_ga, estradas_bloqueadas, nome_arquivo=
                 <td>{row['Custo Extra']}</td>
                 <td>{row['Custo Total']}</td>
                 <td>{row['Tempo Execução (s)']}</td>
-                <td>{row['Iterações/Formigas']}</td>
+                <td>{row['Iterações']}</td>
             </tr>
         """
     tabela_html += "</table></div>"
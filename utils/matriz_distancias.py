@@ -0,0 +1,108 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+SEM_CAMINHO = 9999
+
+
+class MatrizDistancias:
+    def __init__(self, cidades, distancias):
+        self.cidades = list(cidades)
+        self.indice = {cidade: i for i, cidade in enumerate(self.cidades)}
+        self.distancias = np.ascontiguousarray(distancias, dtype=np.float64)
+
+    @classmethod
+    def de_grafo(cls, grafo, sem_caminho=SEM_CAMINHO):
+        if isinstance(grafo, cls):
+            return grafo
+
+        cidades = list(grafo.keys())
+        for vizinhos in grafo.values():
+            for vizinho in vizinhos:
+                if vizinho not in grafo:
+                    cidades.append(vizinho)
+        cidades = list(dict.fromkeys(cidades))
+        indice = {cidade: i for i, cidade in enumerate(cidades)}
+
+        n = len(cidades)
+        distancias = np.full((n, n), sem_caminho, dtype=np.float64)
+        np.fill_diagonal(distancias, 0.0)
+        for cidade, vizinhos in grafo.items():
+            i = indice[cidade]
+            for vizinho, distancia in vizinhos.items():
+                distancias[i, indice[vizinho]] = distancia
+
+        return cls(cidades, distancias)
+
+    def __len__(self):
+        return len(self.cidades)
+
+    def ids(self, rota):
+        return np.array([self.indice[cidade] for cidade in rota], dtype=np.intp)
+
+    def nomes(self, ids):
+        return [self.cidades[i] for i in ids]
+
+    def custo_rota(self, rota):
+        return float(self.distancias[rota[:-1], rota[1:]].sum())
+
+    def heuristica(self, beta=1.0):
+        eta = np.zeros_like(self.distancias)
+        positivas = self.distancias > 0
+        eta[positivas] = 1.0 / self.distancias[positivas]
+        return eta ** beta
+
+    def vizinhos_proximos(self, k):
+        k = min(k, len(self) - 1)
+        distancias = self.distancias.copy()
+        np.fill_diagonal(distancias, np.inf)
+        proximos = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+        ordem = np.argsort(np.take_along_axis(distancias, proximos, axis=1), axis=1)
+        return np.take_along_axis(proximos, ordem, axis=1)
+
+    def rota_gulosa(self, origem=0):
+        n = len(self)
+        visitados = np.zeros(n, dtype=bool)
+        rota = np.empty(n + 1, dtype=np.intp)
+        rota[0] = rota[-1] = origem
+        visitados[origem] = True
+
+        for passo in range(1, n):
+            linha = np.where(visitados, np.inf, self.distancias[rota[passo - 1]])
+            rota[passo] = np.argmin(linha)
+            visitados[rota[passo]] = True
+        return rota
+
+    def para_dict(self):
+        return {
+            origem: {
+                destino: float(self.distancias[i, j])
+                for j, destino in enumerate(self.cidades) if i != j
+            }
+            for i, origem in enumerate(self.cidades)
+        }
+
+
+class MatrizCompartilhada:
+    def __init__(self, matriz):
+        self.memoria = shared_memory.SharedMemory(create=True, size=max(matriz.distancias.nbytes, 1))
+        distancias = np.ndarray(matriz.distancias.shape, dtype=np.float64, buffer=self.memoria.buf)
+        distancias[:] = matriz.distancias
+        self.descritor = (self.memoria.name, matriz.distancias.shape, matriz.cidades)
+
+    def fechar(self):
+        self.memoria.close()
+        self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+def anexar_matriz(descritor):
+    nome, forma, cidades = descritor
+    memoria = shared_memory.SharedMemory(name=nome)
+    distancias = np.ndarray(forma, dtype=np.float64, buffer=memoria.buf)
+    return MatrizDistancias(cidades, distancias), memoria
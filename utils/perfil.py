@@ -0,0 +1,102 @@
+import json
+import time
+from contextlib import nullcontext
+
+# Com o perfil desligado, fase() devolve sempre o mesmo contexto vazio: não mede nem aloca nada
+NULO = nullcontext()
+
+perfil_atual = None
+
+
+class Fase:
+    __slots__ = ("perfil", "nome", "inicio")
+
+    def __init__(self, perfil, nome):
+        self.perfil = perfil
+        self.nome = nome
+
+    def __enter__(self):
+        self.perfil.pilha.append(self.nome)
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *erro):
+        duracao = time.perf_counter_ns() - self.inicio
+        pilha = self.perfil.pilha
+        caminho = ";".join(pilha)
+        acumulado = self.perfil.fases.get(caminho)
+        if acumulado is None:
+            self.perfil.fases[caminho] = [duracao, 1]
+        else:
+            acumulado[0] += duracao
+            acumulado[1] += 1
+        pilha.pop()
+        return False
+
+
+class Perfil:
+    def __init__(self):
+        self.pilha = []
+        self.fases = {}
+        self.inicio = time.perf_counter_ns()
+
+    def juntar(self, fases):
+        # Incorpora fases medidas em outro processo, penduradas sob a fase atual
+        for caminho, (total, chamadas) in fases.items():
+            caminho = ";".join(self.pilha + [caminho])
+            acumulado = self.fases.setdefault(caminho, [0, 0])
+            acumulado[0] += total
+            acumulado[1] += chamadas
+
+    def relatorio(self):
+        proprios = {caminho: total for caminho, (total, _) in self.fases.items()}
+        for caminho, (total, _) in self.fases.items():
+            pai = caminho.rpartition(";")[0]
+            if pai in proprios:
+                proprios[pai] -= total
+
+        return {
+            "duracao_total_ns": time.perf_counter_ns() - self.inicio,
+            "fases": [
+                {
+                    "caminho": caminho,
+                    "total_ns": total,
+                    "proprio_ns": max(proprios[caminho], 0),
+                    "chamadas": chamadas
+                }
+                for caminho, (total, chamadas) in sorted(self.fases.items())
+            ]
+        }
+
+    def salvar_json(self, caminho_arquivo):
+        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+            json.dump(self.relatorio(), arquivo, ensure_ascii=False, indent=2)
+
+    def salvar_flamegraph(self, caminho_arquivo):
+        # Formato "folded" (pilha;separada;por;ponto-e-vírgula valor), lido por flamegraph.pl e speedscope
+        with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
+            for fase in self.relatorio()["fases"]:
+                if fase["proprio_ns"] > 0:
+                    arquivo.write(f"{fase['caminho'].replace(' ', '_')} {fase['proprio_ns']}\n")
+
+
+def ativar_perfil():
+    global perfil_atual
+    perfil_atual = Perfil()
+    return perfil_atual
+
+
+def desativar_perfil():
+    global perfil_atual
+    perfil, perfil_atual = perfil_atual, None
+    return perfil
+
+
+def perfil_ativo():
+    return perfil_atual
+
+
+def fase(nome):
+    if perfil_atual is None:
+        return NULO
+    return Fase(perfil_atual, nome)
@@ -0,0 +1,59 @@
+import heapq
+
+import numpy as np
+
+
+def assinatura_rota(rota):
+    rota = tuple(rota.tolist()) if isinstance(rota, np.ndarray) else tuple(rota)
+    return min(rota, rota[::-1])
+
+
+class TopRotas:
+    def __init__(self, k=3):
+        self.k = k
+        self.heap = []
+        self.assinaturas = set()
+        self.contador = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def limite(self):
+        if len(self.heap) < self.k:
+            return float('inf')
+        return -self.heap[0][0]
+
+    def adicionar(self, rota, distancia):
+        if distancia >= self.limite():
+            return False
+
+        chave = assinatura_rota(rota)
+        if chave in self.assinaturas:
+            return False
+
+        # Heap de máximo (distância negada): a raiz é a pior rota mantida
+        self.contador += 1
+        heapq.heappush(self.heap, (-distancia, self.contador, chave, np.array(rota)))
+        self.assinaturas.add(chave)
+        if len(self.heap) > self.k:
+            _, _, removida, _ = heapq.heappop(self.heap)
+            self.assinaturas.discard(removida)
+        return True
+
+    def adicionar_lote(self, rotas, distancias):
+        distancias = np.asarray(distancias, dtype=np.float64)
+        candidatas = np.flatnonzero(distancias < self.limite())
+        for i in candidatas[np.argsort(distancias[candidatas], kind='stable')]:
+            if distancias[i] >= self.limite():
+                break
+            self.adicionar(rotas[i], float(distancias[i]))
+
+    def juntar(self, outra):
+        for rota, distancia in outra.melhores():
+            self.adicionar(rota, distancia)
+
+    def melhores(self):
+        return [
+            (rota, -distancia_negada)
+            for distancia_negada, _, _, rota in sorted(self.heap, key=lambda item: (-item[0], item[1]))
+        ]